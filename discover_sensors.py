@@ -1,17 +1,34 @@
 #!/usr/bin/env python3
 
 import argparse
+import copy
+import os
 import sys
 import yaml
 import asyncio
+from collections import OrderedDict
 from bleak import BleakScanner
 
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Parsed configs keyed by absolute path: (mtime_ns, size, config)
+_yaml_cache = OrderedDict()
+_YAML_CACHE_MAX = 100
+
+# Maximum scan duration, and how long to keep scanning after the last new
+# sensor was heard (LYWSD03MMC advertises every 1-2 seconds)
+SCAN_TIMEOUT = 10.0
+SCAN_IDLE_TIMEOUT = 4.0
+
 
 async def discover_xiaomi_sensors():
     """Scan for Xiaomi LYWSD03MMC sensors and return their MAC addresses.
 
-    This function performs a Bluetooth Low Energy (BLE) scan for 10 seconds to
-    discover Xiaomi LYWSD03MMC temperature and humidity sensors in range.
+    This function performs a Bluetooth Low Energy (BLE) scan for up to 10 seconds
+    to discover Xiaomi LYWSD03MMC temperature and humidity sensors in range. The
+    scan stops early once no new sensor has been heard for 4 seconds.
 
     Returns:
         list: A list of dictionaries containing discovered sensors. Each dictionary
@@ -22,17 +39,35 @@ async def discover_xiaomi_sensors():
     Raises:
         Exception: If there's an error during the BLE scanning process
     """
-    print("Scanning for Xiaomi sensors... (this will take 10 seconds)")
+    print("Scanning for Xiaomi sensors... (this will take up to 10 seconds)")
     xiaomi_sensors = []
+    seen = set()
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    idle_timer = None
+
+    def detection_callback(device, advertisement_data):
+        nonlocal idle_timer
+        # LYWSD03MMC sensors advertise with this name
+        if device.name and "LYWSD03MMC" in device.name and device.address not in seen:
+            seen.add(device.address)
+            xiaomi_sensors.append({"mac_address": device.address, "name": device.name})
+            # Restart the idle countdown on every newly heard sensor
+            if idle_timer:
+                idle_timer.cancel()
+            idle_timer = loop.call_later(SCAN_IDLE_TIMEOUT, stop_event.set)
 
     try:
-        devices = await BleakScanner.discover(timeout=10.0)
-        for device in devices:
-            # LYWSD03MMC sensors advertise with this name
-            if device.name and "LYWSD03MMC" in device.name:
-                xiaomi_sensors.append(
-                    {"mac_address": device.address, "name": device.name}
-                )
+        scanner = BleakScanner(detection_callback=detection_callback)
+        await scanner.start()
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=SCAN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if idle_timer:
+                idle_timer.cancel()
+            await scanner.stop()
     except Exception as e:
         print(f"Error during scanning: {e}")
         sys.exit(1)
@@ -46,6 +81,10 @@ def load_config(config_path):
     Args:
         config_path (str): Path to the YAML configuration file
 
+    Parsed configurations are cached by path and invalidated when the file's
+    modification time or size changes. Callers always receive a deep copy, so
+    the returned dictionary can be modified freely.
+
     Returns:
         dict: Configuration dictionary containing sensor information. If the file
             doesn't exist, returns a dictionary with an empty sensors list.
@@ -55,8 +94,21 @@ def load_config(config_path):
         Exception: If there's an error reading the configuration file
     """
     try:
+        st = os.stat(config_path)
+        key = os.path.abspath(config_path)
+        hit = _yaml_cache.get(key)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            _yaml_cache.move_to_end(key)
+            return copy.deepcopy(hit[2])
+
         with open(config_path, "r") as f:
-            return yaml.safe_load(f) or {"sensors": []}
+            config = yaml.load(f, Loader=YAML_LOADER) or {"sensors": []}
+
+        _yaml_cache[key] = (st.st_mtime_ns, st.st_size, config)
+        _yaml_cache.move_to_end(key)
+        if len(_yaml_cache) > _YAML_CACHE_MAX:
+            _yaml_cache.popitem(last=False)
+        return copy.deepcopy(config)
     except FileNotFoundError:
         return {"sensors": []}
     except Exception as e:
@@ -76,7 +128,7 @@ def save_config(config, config_path):
     """
     try:
         with open(config_path, "w") as f:
-            yaml.dump(config, f, default_flow_style=False)
+            yaml.dump(config, f, Dumper=YAML_DUMPER, default_flow_style=False)
         print(f"\nConfiguration saved to {config_path}")
     except Exception as e:
         print(f"Error saving config file: {e}")
@@ -122,9 +174,10 @@ async def main():
 
     # Load existing config
     config = load_config(args.config)
-    existing_macs = {sensor["mac_address"] for sensor in config["sensors"]}
+    # Compare MACs case-insensitively, the scanner and the YAML may differ
+    existing_macs = {s["mac_address"].upper() for s in config["sensors"]}
     new_sensors = [
-        s for s in discovered_sensors if s["mac_address"] not in existing_macs
+        s for s in discovered_sensors if s["mac_address"].upper() not in existing_macs
     ]
 
     if not new_sensors:
@@ -148,10 +201,12 @@ async def main():
             alias = input(
                 f"Enter alias for sensor {sensor['mac_address']} (press Enter to skip): "
             ).strip()
+            # Stored uppercase, like the existing config entries
+            mac_address = sensor["mac_address"].upper()
             config["sensors"].append(
                 {
-                    "mac_address": sensor["mac_address"],
-                    "alias": alias if alias else sensor["mac_address"],
+                    "mac_address": mac_address,
+                    "alias": alias if alias else mac_address,
                 }
             )
         save_config(config, args.config)
@@ -17,6 +17,7 @@ Example usage:
 
 import argparse
 import random
+from math import sin, pi
 from datetime import datetime, timedelta
 from homemon.database import SensorDatabase
 
@@ -91,26 +92,40 @@ def generate_sample_data(
             num_samples = num_samples or 50  # Default to 50 if not specified
             start_time = end_time - timedelta(minutes=interval_mins * num_samples)
 
+        # Timestamps and the time-of-day variation (±1.5°C) only depend on the
+        # sample's position in the shared time grid, so compute them once
+        # instead of per sensor. Temperature peaks at 14:00 (2pm)
+        pi_over_12 = pi / 12
+        delta = timedelta(minutes=interval_mins)
+        time_grid = []
+        current_time = start_time
+        for _ in range(num_samples):
+            hour = current_time.hour
+            time_grid.append(
+                (current_time.isoformat(), 1.5 * sin((hour - 6) * pi_over_12))
+            )
+            current_time += delta
+
+        # A dedicated generator for the samples, and the hot loop's lookups
+        # bound once
+        rng = random.Random()
+        uniform = rng.uniform
+        rows = []
+        append_row = rows.append
         for idx, sensor_id in enumerate(sensor_ids):
-            current_time = start_time
             current_temp = base_temps[idx]
             current_humidity = base_humidities[idx]
 
-            for _ in range(num_samples):
+            for iso_time, time_variation in time_grid:
                 # Add some random variation to temperature (-0.3 to +0.3°C)
-                temp_variation = random.uniform(-0.3, 0.3)
-
-                # Add time-of-day variation (±1.5°C)
-                hour = current_time.hour
-                # Temperature peaks at 14:00 (2pm)
-                time_variation = 1.5 * math.sin((hour - 6) * math.pi / 12)
+                temp_variation = uniform(-0.3, 0.3)
 
                 temperature = round(current_temp + temp_variation + time_variation, 1)
                 # Ensure temperature stays within realistic bounds
                 temperature = max(18.0, min(26.0, temperature))
 
                 # Humidity varies inversely with temperature
-                humidity_variation = random.uniform(-2, 2)
+                humidity_variation = uniform(-2, 2)
                 humidity = int(
                     max(
                         30,
@@ -122,30 +137,32 @@ def generate_sample_data(
                 )
 
                 # Battery voltage between 2.8V and 3.0V
-                battery = round(random.uniform(2.8, 3.0), 2)
-
-                # Store the measurement
-                db.cursor.execute(
-                    """
-                    INSERT INTO measurements (
-                        sensor_id, timestamp, temperature, humidity, battery_voltage
-                    ) VALUES (?, ?, ?, ?, ?)
-                    """,
+                battery = round(uniform(2.8, 3.0), 2)
+
+                append_row(
                     (
                         sensor_id,
-                        current_time.isoformat(),
+                        iso_time,
                         temperature,
                         humidity,
                         battery,
-                    ),
+                    )
                 )
 
                 # Update for next iteration
-                current_time += timedelta(minutes=interval_mins)
                 current_temp = temperature
                 current_humidity = humidity
 
-            db.conn.commit()
+        # Store all measurements at once
+        db.cursor.executemany(
+            """
+            INSERT INTO measurements (
+                sensor_id, timestamp, temperature, humidity, battery_voltage
+            ) VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        db.conn.commit()
 
 
 def main():
@@ -233,6 +250,4 @@ Examples:
 
 
 if __name__ == "__main__":
-    import math
-
     main()
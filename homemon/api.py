@@ -5,20 +5,30 @@ It provides endpoints for:
     - Listing and retrieving sensor information
     - Getting recent measurements from all sensors
     - Retrieving historical measurements with optional time filtering
-    - Calculating sensor statistics
+    - Calculating sensor statistics, for one or several sensors at once
     - Retrieving sensor measurement trends
 
-All endpoints return JSON responses and use Pydantic models for validation.
+All endpoints return JSON responses serialized with orjson. Pydantic models
+describe the response schemas; the row-returning endpoints build their
+responses directly and skip per-row model validation.
 """
 
+import asyncio
+import calendar
+import hashlib
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.middleware.cors import CORSMiddleware
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 
 
-from homemon.database import SensorDatabase
+from homemon.database import SensorDatabase, upgrade_schema
 
 
 # Models for API responses
@@ -67,6 +77,23 @@ class RecentMeasurement(BaseModel):
     battery_voltage: float
 
 
+class SensorMeasurement(BaseModel):
+    """Model representing a measurement of one of several requested sensors.
+
+    Attributes:
+        sensor_id (int): ID of the sensor that took the measurement
+        timestamp (datetime): When the measurement was taken
+        temperature (float): Temperature in Celsius
+        humidity (int): Relative humidity percentage
+        battery_voltage (float): Battery voltage in volts
+    """
+    sensor_id: int
+    timestamp: datetime
+    temperature: float
+    humidity: int
+    battery_voltage: float
+
+
 class SensorStats(BaseModel):
     """Model representing statistical data for a sensor's measurements.
 
@@ -77,6 +104,7 @@ class SensorStats(BaseModel):
         max_temperature (float): Maximum recorded temperature
         min_humidity (int): Minimum recorded humidity
         max_humidity (int): Maximum recorded humidity
+        count (int): Number of measurements the statistics are computed from
     """
     average_temperature: float
     average_humidity: float
@@ -84,21 +112,301 @@ class SensorStats(BaseModel):
     max_temperature: float
     min_humidity: int
     max_humidity: int
+    count: int
+
+
+class SensorStatsItem(SensorStats):
+    """Model representing statistics of one of several requested sensors.
+
+    Attributes:
+        sensor_id (int): ID of the sensor the statistics are for
+    """
+    sensor_id: int
+
+
+# Read-only database connections per API process
+DB_POOL_SIZE = 4
+
+
+class _ReaderPool:
+    """Fixed set of read-only database connections shared by worker threads.
+
+    Each query checks out a connection of its own, so queries from concurrent
+    requests run in parallel instead of queueing for a single connection.
+    """
+
+    def __init__(self, db_path: str, size: int):
+        self.databases = []
+        self.idle = queue.SimpleQueue()
+        for _ in range(size):
+            db = SensorDatabase(db_path, read_only=True, check_same_thread=False)
+            # Up to 64 MB of page cache across the pool
+            db.conn.execute(f"PRAGMA cache_size=-{65536 // size}")
+            db.conn.row_factory = sqlite3.Row
+            self.databases.append(db)
+            self.idle.put(db.conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection, waiting for one to become idle if needed."""
+        conn = self.idle.get()
+        try:
+            yield conn
+        finally:
+            self.idle.put(conn)
+
+    def close(self):
+        """Close all connections of the pool."""
+        for db in self.databases:
+            db.close()
+
+
+def make_etag(content: bytes) -> str:
+    """Compute a strong ETag for a response body.
+
+    Args:
+        content (bytes): The response body
+
+    Returns:
+        str: Quoted ETag value
+    """
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_response(
+    request: Request,
+    content: bytes,
+    etag: str,
+    media_type: str,
+    cache_control: str = "no-cache",
+) -> Response:
+    """Build a response for a body with a known ETag.
+
+    If the client already has this version (If-None-Match), an empty
+    304 Not Modified response is returned instead of the body. The tags are
+    compared weakly, so the weak ETag of a compressed copy matches too.
+
+    Args:
+        request (Request): The incoming HTTP request
+        content (bytes): The response body
+        etag (str): ETag of the body, as returned by make_etag
+        media_type (str): Media type of the body
+        cache_control (str): Cache-Control header value (default: revalidate
+            on every use)
+
+    Returns:
+        Response: The response to send
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if tags == ["*"] or etag in tags or f"W/{etag}" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content, media_type=media_type, headers=headers)
+
+
+class _TTLCache:
+    """Cache for a single value that expires after a fixed number of seconds.
+
+    Concurrent requests that miss the cache wait on a lock, so only one of them
+    refills the value.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.expires = 0.0
+        self.value = None
+        self.lock = asyncio.Lock()
+
+    async def get(self, fill):
+        """Return the cached value, awaiting ``fill()`` to refresh it if expired."""
+        if time.monotonic() < self.expires:
+            return self.value
+        async with self.lock:
+            # Another request may have refreshed the value while we waited
+            if time.monotonic() < self.expires:
+                return self.value
+            self.value = await fill()
+            self.expires = time.monotonic() + self.ttl
+            return self.value
+
+
+def _time_range_variants(select: str, order_by: str = "") -> dict:
+    """Build a query for every combination of the optional time filters.
+
+    Args:
+        select (str): SELECT ... FROM part of the query
+        order_by (str): Optional ORDER BY clause appended to the query
+
+    Returns:
+        dict: Query strings keyed by ``(has_start_time, has_end_time)``
+    """
+    variants = {}
+    for has_start in (False, True):
+        for has_end in (False, True):
+            query = f"{select} WHERE sensor_id = ?"
+            if has_start:
+                query += " AND ts_epoch >= ?"
+            if has_end:
+                query += " AND ts_epoch <= ?"
+            if order_by:
+                query += f" {order_by}"
+            variants[has_start, has_end] = query
+    return variants
+
+
+def _epoch(value: datetime) -> int:
+    """Convert a datetime to the integer stored in ``measurements.ts_epoch``.
+
+    Stored timestamps are naive local time, so the wall-clock fields are
+    converted as if they were UTC, the same way SQLite's strftime('%s') does.
+    Any timezone offset is ignored, matching the previous text comparison.
+    """
+    return calendar.timegm(value.timetuple())
+
+
+def _time_range_query(variants: dict, sensor_id: int, start_time, end_time):
+    """Pick the query variant and parameters for the given time filters.
+
+    Args:
+        variants (dict): Query variants built by ``_time_range_variants``
+        sensor_id (int): ID of the sensor
+        start_time (Optional[datetime]): Start of the time range (inclusive)
+        end_time (Optional[datetime]): End of the time range (inclusive)
+
+    Returns:
+        tuple: The query string and its parameters
+    """
+    params = [sensor_id]
+    if start_time:
+        params.append(_epoch(start_time))
+    if end_time:
+        params.append(_epoch(end_time))
+    return variants[bool(start_time), bool(end_time)], params
+
+
+# SQL statements are built once so each request reuses the same statement text
+# and hits sqlite3's prepared statement cache. Column names match the response
+# fields so rows can be converted with dict(row).
+_SQL_SENSORS = "SELECT id, mac_address, alias FROM sensors"
+_SQL_SENSOR = "SELECT id, mac_address, alias FROM sensors WHERE id = ?"
+# Grouped MAX is resolved from the (sensor_id, timestamp) index without
+# ranking and sorting the whole measurements table
+_SQL_RECENT = """
+    SELECT
+        m.sensor_id,
+        m.timestamp,
+        ROUND(m.temperature, 2) AS temperature,
+        m.humidity,
+        ROUND(m.battery_voltage, 3) AS battery_voltage
+    FROM measurements m
+    JOIN (
+        SELECT sensor_id, MAX(timestamp) AS ts
+        FROM measurements
+        GROUP BY sensor_id
+    ) latest
+    ON m.sensor_id = latest.sensor_id AND m.timestamp = latest.ts
+"""
+_SQL_MEAS_BASE = """
+    SELECT
+        timestamp,
+        ROUND(temperature, 2) AS temperature,
+        humidity,
+        ROUND(battery_voltage, 3) AS battery_voltage
+    FROM measurements
+"""
+# Range filters and ordering use the integer ts_epoch column and its
+# (sensor_id, ts_epoch) index instead of comparing timestamp strings
+_SQL_MEASUREMENTS = _time_range_variants(_SQL_MEAS_BASE, "ORDER BY ts_epoch DESC")
+_SQL_TREND = _time_range_variants(_SQL_MEAS_BASE, "ORDER BY ts_epoch ASC")
+_SQL_SENSORS_MEAS_BASE = """
+    SELECT
+        sensor_id,
+        timestamp,
+        ROUND(temperature, 2) AS temperature,
+        humidity,
+        ROUND(battery_voltage, 3) AS battery_voltage
+    FROM measurements
+"""
+_SQL_STATS_COLUMNS = """
+        COUNT(*) AS count,
+        ROUND(AVG(temperature), 2) AS average_temperature,
+        AVG(humidity) AS average_humidity,
+        ROUND(MIN(temperature), 2) AS min_temperature,
+        ROUND(MAX(temperature), 2) AS max_temperature,
+        MIN(humidity) AS min_humidity,
+        MAX(humidity) AS max_humidity
+"""
+_SQL_STATS = _time_range_variants(f"SELECT {_SQL_STATS_COLUMNS} FROM measurements")
+_SQL_SENSORS_STATS_BASE = f"SELECT sensor_id, {_SQL_STATS_COLUMNS} FROM measurements"
+
+
+def _sensors_query(
+    select: str, sensor_ids: List[int], start_time, end_time, suffix: str
+):
+    """Build a query over the measurements of several sensors.
+
+    Args:
+        select (str): SELECT ... FROM part of the query
+        sensor_ids (List[int]): IDs of the sensors
+        start_time (Optional[datetime]): Start of the time range (inclusive)
+        end_time (Optional[datetime]): End of the time range (inclusive)
+        suffix (str): GROUP BY or ORDER BY clause appended to the query
+
+    Returns:
+        tuple: The query string and its parameters
+    """
+    placeholders = ", ".join("?" * len(sensor_ids))
+    query = f"{select} WHERE sensor_id IN ({placeholders})"
+    params = list(sensor_ids)
+    if start_time:
+        query += " AND ts_epoch >= ?"
+        params.append(_epoch(start_time))
+    if end_time:
+        query += " AND ts_epoch <= ?"
+        params.append(_epoch(end_time))
+    return f"{query} {suffix}", params
+
+
+def _parse_sensor_ids(sensor_ids: str) -> List[int]:
+    """Parse a comma-separated list of sensor IDs from a query parameter.
+
+    Args:
+        sensor_ids (str): Comma-separated sensor IDs
+
+    Returns:
+        List[int]: The unique IDs in ascending order
+
+    Raises:
+        HTTPException: If the list is invalid or empty
+    """
+    try:
+        ids = sorted({int(i) for i in sensor_ids.split(",") if i.strip()})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sensor_ids")
+    if not ids:
+        raise HTTPException(status_code=400, detail="No sensor_ids given")
+    return ids
 
 
 # Global variable to store database path
 db_path: str = None
 
 
-def init_app(database_path: str) -> FastAPI:
+def init_app(database_path: str, pool_size: int = DB_POOL_SIZE) -> FastAPI:
     """Initialize FastAPI application with the specified database path.
 
     This function creates and configures a FastAPI application with all necessary
-    routes and middleware. It sets up CORS for cross-origin requests and
-    initializes the database connection.
+    routes. It upgrades an outdated database schema and opens a pool of
+    read-only database connections that is shared by all requests (stored as
+    ``app.state.db``) and closed on application shutdown. CORS is configured
+    by the application the API is mounted in (homemon.asgi.create_app), so it
+    applies to a single set of origins.
 
     Args:
         database_path (str): Path to the SQLite database file
+        pool_size (int): Number of database connections (default: DB_POOL_SIZE)
 
     Returns:
         FastAPI: Configured FastAPI application instance
@@ -110,21 +418,73 @@ def init_app(database_path: str) -> FastAPI:
         title="Home Monitor API",
         description="API for retrieving sensor data and measurements from the SQLite database.",
         version="1.0.0",
+        default_response_class=ORJSONResponse,
     )
 
-    # Add CORS middleware
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # Allows all origins
-        allow_credentials=True,
-        allow_methods=["*"],  # Allows all methods
-        allow_headers=["*"],  # Allows all headers
-    )
+    # Queries need the current schema, migrate databases the monitor hasn't
+    # opened since an upgrade
+    upgrade_schema(db_path)
+
+    # Open long-lived connections instead of reconnecting on every request
+    db = _ReaderPool(db_path, pool_size)
+    app.state.db = db
+
+    @app.on_event("shutdown")
+    def close_database():
+        """Close the shared database connections."""
+        db.close()
+
+    def query_all(query: str, params=()) -> list:
+        """Run a query on a pooled connection and return all rows."""
+        with db.connection() as conn:
+            return conn.execute(query, params).fetchall()
+
+    def query_one(query: str, params=()):
+        """Run a query on a pooled connection and return the first row."""
+        with db.connection() as conn:
+            return conn.execute(query, params).fetchone()
+
+    # SQLite calls block, run them in a worker thread to keep the event loop free
+    async def fetchall(query: str, params=()) -> list:
+        """Asynchronously run a query and return all rows."""
+        return await asyncio.to_thread(query_all, query, params)
+
+    async def fetchone(query: str, params=()):
+        """Asynchronously run a query and return the first row."""
+        return await asyncio.to_thread(query_one, query, params)
+
+    async def load_sensors() -> tuple:
+        """Load all sensors as an encoded JSON array and its ETag."""
+        content = orjson.dumps([dict(s) for s in await fetchall(_SQL_SENSORS)])
+        return content, make_etag(content)
+
+    async def load_recent() -> tuple:
+        """Load the latest measurement of each sensor as JSON and its ETag."""
+        content = orjson.dumps([dict(m) for m in await fetchall(_SQL_RECENT)])
+        return content, make_etag(content)
+
+    # Sensors and latest readings change at most once per polling interval.
+    # The caches hold encoded JSON, so a hit does no per-request serialization,
+    # along with its ETag so clients can revalidate with If-None-Match.
+    # The database is written by another process, so entries expire by TTL
+    # rather than being invalidated on writes.
+    sensors_cache = _TTLCache(60)
+    recent_cache = _TTLCache(5)
+
+    # Handlers return ORJSONResponse themselves: response_model only documents
+    # the schema and FastAPI does not re-validate every row. Stored timestamps
+    # are already ISO 8601 strings.
 
     @app.get("/sensors", response_model=List[Sensor])
-    async def list_sensors():
+    async def list_sensors(request: Request):
         """List all sensors and their metadata.
 
+        The result is cached for 60 seconds. Requests with a matching
+        If-None-Match header get an empty 304 Not Modified response.
+
+        Args:
+            request (Request): The incoming HTTP request
+
         Returns:
             List[Sensor]: List of all sensors in the database
 
@@ -132,11 +492,8 @@ def init_app(database_path: str) -> FastAPI:
             HTTPException: If there's an error accessing the database
         """
         try:
-            db = SensorDatabase(db_path, read_only=True)
-            db.cursor.execute("SELECT id, mac_address, alias FROM sensors")
-            sensors = db.cursor.fetchall()
-            db.close()
-            return [{"id": s[0], "mac_address": s[1], "alias": s[2]} for s in sensors]
+            content, etag = await sensors_cache.get(load_sensors)
+            return etag_response(request, content, etag, "application/json")
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -154,24 +511,25 @@ def init_app(database_path: str) -> FastAPI:
             HTTPException: If the sensor is not found or there's a database error
         """
         try:
-            db = SensorDatabase(db_path, read_only=True)
-            db.cursor.execute(
-                "SELECT id, mac_address, alias FROM sensors WHERE id = ?", (id,)
-            )
-            sensor = db.cursor.fetchone()
-            db.close()
+            sensor = await fetchone(_SQL_SENSOR, (id,))
             if not sensor:
                 raise HTTPException(status_code=404, detail="Sensor not found")
-            return {"id": sensor[0], "mac_address": sensor[1], "alias": sensor[2]}
+            return ORJSONResponse(dict(sensor))
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
     @app.get("/measurements/recent", response_model=List[RecentMeasurement])
-    async def get_recent_measurements():
+    async def get_recent_measurements(request: Request):
         """Get the most recent measurements for all sensors.
 
+        The result is cached for 5 seconds. Requests with a matching
+        If-None-Match header get an empty 304 Not Modified response.
+
+        Args:
+            request (Request): The incoming HTTP request
+
         Returns:
             List[RecentMeasurement]: List of the latest measurement from each sensor
 
@@ -179,41 +537,79 @@ def init_app(database_path: str) -> FastAPI:
             HTTPException: If there's an error accessing the database
         """
         try:
-            db = SensorDatabase(db_path, read_only=True)
-            db.cursor.execute(
-                """
-                WITH RankedMeasurements AS (
-                    SELECT 
-                        sensor_id,
-                        timestamp,
-                        temperature,
-                        humidity,
-                        battery_voltage,
-                        ROW_NUMBER() OVER (PARTITION BY sensor_id ORDER BY timestamp DESC) as rn
-                    FROM measurements
-                )
-                SELECT 
-                    sensor_id,
-                    timestamp,
-                    temperature,
-                    humidity,
-                    battery_voltage
-                FROM RankedMeasurements
-                WHERE rn = 1
-            """
+            content, etag = await recent_cache.get(load_recent)
+            return etag_response(request, content, etag, "application/json")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.get("/measurements", response_model=List[SensorMeasurement])
+    async def get_sensors_measurements(
+        sensor_ids: str = Query(..., description="Comma-separated sensor IDs"),
+        start_time: Optional[datetime] = Query(None),
+        end_time: Optional[datetime] = Query(None),
+    ):
+        """Get measurements of several sensors within a time range at once.
+
+        Args:
+            sensor_ids (str): Comma-separated IDs of the sensors
+            start_time (Optional[datetime]): Start of the time range (inclusive)
+            end_time (Optional[datetime]): End of the time range (inclusive)
+
+        Returns:
+            List[SensorMeasurement]: Measurements ordered by sensor ID and
+                ascending timestamp
+
+        Raises:
+            HTTPException: If the sensor IDs are invalid or there's an error
+                accessing the database
+        """
+        ids = _parse_sensor_ids(sensor_ids)
+        try:
+            query, params = _sensors_query(
+                _SQL_SENSORS_MEAS_BASE,
+                ids,
+                start_time,
+                end_time,
+                "ORDER BY sensor_id, ts_epoch ASC",
             )
-            measurements = db.cursor.fetchall()
-            db.close()
-            return [
-                {
-                    "sensor_id": m[0],
-                    "timestamp": m[1],
-                    "temperature": round(m[2], 2),
-                    "humidity": m[3],
-                    "battery_voltage": round(m[4], 3),
-                }
-                for m in measurements
-            ]
+            measurements = await fetchall(query, params)
+            return ORJSONResponse([dict(m) for m in measurements])
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    # Registered before /measurements/{sensor_id}, which would match it too
+    @app.get("/measurements/stats", response_model=List[SensorStatsItem])
+    async def get_sensors_stats(
+        sensor_ids: str = Query(..., description="Comma-separated sensor IDs"),
+        start_time: Optional[datetime] = Query(None),
+        end_time: Optional[datetime] = Query(None),
+    ):
+        """Get summary statistics of several sensors with a single query.
+
+        Args:
+            sensor_ids (str): Comma-separated IDs of the sensors
+            start_time (Optional[datetime]): Start of the time range (inclusive)
+            end_time (Optional[datetime]): End of the time range (inclusive)
+
+        Returns:
+            List[SensorStatsItem]: Statistics ordered by sensor ID, sensors
+                without measurements in the time range are left out
+
+        Raises:
+            HTTPException: If the sensor IDs are invalid or there's an error
+                accessing the database
+        """
+        ids = _parse_sensor_ids(sensor_ids)
+        try:
+            query, params = _sensors_query(
+                _SQL_SENSORS_STATS_BASE,
+                ids,
+                start_time,
+                end_time,
+                "GROUP BY sensor_id ORDER BY sensor_id",
+            )
+            stats = await fetchall(query, params)
+            return ORJSONResponse([dict(s) for s in stats])
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -237,35 +633,11 @@ def init_app(database_path: str) -> FastAPI:
             HTTPException: If there's an error accessing the database
         """
         try:
-            db = SensorDatabase(db_path, read_only=True)
-            query = """
-                SELECT timestamp, temperature, humidity, battery_voltage
-                FROM measurements
-                WHERE sensor_id = ?
-            """
-            params = [sensor_id]
-
-            if start_time:
-                query += " AND timestamp >= ?"
-                params.append(start_time.isoformat())
-            if end_time:
-                query += " AND timestamp <= ?"
-                params.append(end_time.isoformat())
-
-            query += " ORDER BY timestamp DESC"
-
-            db.cursor.execute(query, params)
-            measurements = db.cursor.fetchall()
-            db.close()
-            return [
-                {
-                    "timestamp": m[0],
-                    "temperature": round(m[1], 2),
-                    "humidity": m[2],
-                    "battery_voltage": round(m[3], 3),
-                }
-                for m in measurements
-            ]
+            query, params = _time_range_query(
+                _SQL_MEASUREMENTS, sensor_id, start_time, end_time
+            )
+            measurements = await fetchall(query, params)
+            return ORJSONResponse([dict(m) for m in measurements])
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -289,45 +661,19 @@ def init_app(database_path: str) -> FastAPI:
             HTTPException: If no measurements are found or there's a database error
         """
         try:
-            db = SensorDatabase(db_path, read_only=True)
-            query = """
-                SELECT 
-                    AVG(temperature) as avg_temp,
-                    AVG(humidity) as avg_hum,
-                    MIN(temperature) as min_temp,
-                    MAX(temperature) as max_temp,
-                    MIN(humidity) as min_hum,
-                    MAX(humidity) as max_hum
-                FROM measurements
-                WHERE sensor_id = ?
-            """
-            params = [sensor_id]
-
-            if start_time:
-                query += " AND timestamp >= ?"
-                params.append(start_time.isoformat())
-            if end_time:
-                query += " AND timestamp <= ?"
-                params.append(end_time.isoformat())
-
-            db.cursor.execute(query, params)
-            stats = db.cursor.fetchone()
-            db.close()
+            query, params = _time_range_query(
+                _SQL_STATS, sensor_id, start_time, end_time
+            )
+            stats = await fetchone(query, params)
 
-            if not stats[0]:  # If no data found
+            if stats["count"] == 0:
                 raise HTTPException(
                     status_code=404,
                     detail="No measurements found for this sensor in the specified time range",
                 )
 
-            return {
-                "average_temperature": round(float(stats[0]), 2),
-                "average_humidity": float(stats[1]),
-                "min_temperature": round(float(stats[2]), 2),
-                "max_temperature": round(float(stats[3]), 2),
-                "min_humidity": int(stats[4]),
-                "max_humidity": int(stats[5]),
-            }
+            # Columns are already named and rounded like the response fields
+            return ORJSONResponse(dict(stats))
         except HTTPException:
             raise
         except Exception as e:
@@ -356,35 +702,11 @@ def init_app(database_path: str) -> FastAPI:
             HTTPException: If there's an error accessing the database
         """
         try:
-            db = SensorDatabase(db_path, read_only=True)
-            query = """
-                SELECT timestamp, temperature, humidity, battery_voltage
-                FROM measurements
-                WHERE sensor_id = ?
-            """
-            params = [sensor_id]
-
-            if start_time:
-                query += " AND timestamp >= ?"
-                params.append(start_time.isoformat())
-            if end_time:
-                query += " AND timestamp <= ?"
-                params.append(end_time.isoformat())
-
-            query += " ORDER BY timestamp ASC"
-
-            db.cursor.execute(query, params)
-            measurements = db.cursor.fetchall()
-            db.close()
-            return [
-                {
-                    "timestamp": m[0],
-                    "temperature": round(m[1], 2),
-                    "humidity": m[2],
-                    "battery_voltage": round(m[3], 3),
-                }
-                for m in measurements
-            ]
+            query, params = _time_range_query(
+                _SQL_TREND, sensor_id, start_time, end_time
+            )
+            measurements = await fetchall(query, params)
+            return ORJSONResponse([dict(m) for m in measurements])
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,314 @@
+"""ASGI application factory for the Home Monitor web server.
+
+The application is built by a factory instead of at import time so uvicorn
+can construct it independently in every worker process. Settings are taken
+from environment variables, which run_api.py sets from its command line:
+
+    HOMEMON_DB: Path to the SQLite database file (default: sensor_data.db)
+    HOMEMON_DEV: If set to a non-empty value, disable browser caching of the
+        web UI files for development
+    HOMEMON_CORS_ORIGINS: Comma-separated origins allowed to call the API
+        from other sites (default: any origin)
+
+Example:
+    HOMEMON_DB=sensor_data.db uvicorn --factory homemon.asgi:create_app
+"""
+
+import mimetypes
+import os
+import re
+from typing import Optional, Tuple
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from homemon.api import etag_response, init_app, make_etag
+
+DEFAULT_DB_PATH = "sensor_data.db"
+
+# The web UI lives next to the homemon package
+WEBUI_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "webui"
+)
+
+# A single byte range, multiple ranges are answered with the whole file
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)\Z")
+
+# Cache-Control of web UI files in development mode
+_NO_CACHE_CONTROL = "no-store, no-cache, must-revalidate, proxy-revalidate, max-age=0"
+
+
+class NoCacheMiddleware:
+    """Middleware to disable caching for static files during development.
+
+    This middleware adds headers to prevent caching of static files, which is
+    useful during development to ensure changes are immediately visible. It
+    is plain ASGI, so other requests are passed through without the overhead
+    of BaseHTTPMiddleware.
+
+    Args:
+        app: The ASGI application to wrap
+
+    Note:
+        Only added in development mode (HOMEMON_DEV). Otherwise static files
+        are cached by browsers and revalidated with their ETags.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Handle a request, adding no-cache headers for static files.
+
+        Args:
+            scope (Scope): The ASGI connection scope
+            receive (Receive): The ASGI receive channel
+            send (Send): The ASGI send channel
+        """
+        if scope["type"] != "http" or not scope["path"].startswith("/static/"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_no_cache(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Cache-Control"] = _NO_CACHE_CONTROL
+                headers["Pragma"] = "no-cache"
+                headers["Expires"] = "0"
+            await send(message)
+
+        await self.app(scope, receive, send_no_cache)
+
+
+class CompressionMiddleware:
+    """Middleware to gzip responses without breaking byte ranges.
+
+    Ranges are of the uncompressed content, so requests with a Range header
+    bypass compression. Compressed responses get a weak ETag, which keeps
+    If-Range from resuming a download of one encoding with bytes of another.
+
+    Args:
+        app: The ASGI application to wrap
+        **options: Options of GZipMiddleware
+    """
+
+    def __init__(self, app: ASGIApp, **options):
+        self.app = app
+        self.gzip = GZipMiddleware(app, **options)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Handle a request, compressing the response if possible.
+
+        Args:
+            scope (Scope): The ASGI connection scope
+            receive (Receive): The ASGI receive channel
+            send (Send): The ASGI send channel
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        if "range" in request_headers:
+            await self.app(scope, receive, send)
+            return
+
+        # A 304 answers for the copy the client has, keep its weak ETag
+        if_none_match = request_headers.get("if-none-match", "")
+
+        async def send_weak_etag(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                etag = headers.get("etag")
+                if (
+                    etag
+                    and not etag.startswith("W/")
+                    and (
+                        headers.get("content-encoding") == "gzip"
+                        or (message["status"] == 304 and f"W/{etag}" in if_none_match)
+                    )
+                ):
+                    headers["ETag"] = f"W/{etag}"
+            await send(message)
+
+        await self.gzip(scope, receive, send_weak_etag)
+
+
+def _load_static_files(directory: str) -> dict:
+    """Read all files of a directory tree into memory.
+
+    The web UI is small and never changes while the server runs, so serving
+    it from memory saves opening and reading the files on every request.
+
+    Args:
+        directory (str): Root directory of the files
+
+    Returns:
+        dict: Maps each file's path relative to the directory (with forward
+            slashes) to a tuple of its content, media type and ETag
+    """
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                content = f.read()
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            etag = make_etag(content)
+            relative_path = os.path.relpath(path, directory).replace(os.sep, "/")
+            files[relative_path] = (content, media_type, etag)
+    return files
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a Range header for a file.
+
+    Args:
+        header (str): Value of the Range header
+        size (int): Size of the file in bytes
+
+    Returns:
+        Optional[Tuple[int, int]]: Inclusive first and last byte of the range,
+            or None if the header should be ignored and the whole file sent
+
+    Raises:
+        ValueError: If the range lies outside of the file
+    """
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range, the last N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def create_app() -> FastAPI:
+    """Create the web server application.
+
+    The application:
+        - Adds CORS middleware for cross-origin requests, limited to
+          HOMEMON_CORS_ORIGINS if set
+        - Adds no-cache middleware in development mode (HOMEMON_DEV)
+        - Compresses responses with gzip, except byte ranges
+        - Serves the webui directory's files from memory under /static,
+          including single byte ranges
+        - Initializes and mounts the API endpoints
+        - Sets up the root route to serve index.html
+
+    Returns:
+        FastAPI: The configured application
+    """
+    db_path = os.environ.get("HOMEMON_DB", DEFAULT_DB_PATH)
+    cors_origins = [
+        origin.strip()
+        for origin in os.environ.get("HOMEMON_CORS_ORIGINS", "").split(",")
+        if origin.strip()
+    ]
+
+    # Create the main FastAPI app
+    app = FastAPI()
+
+    # Add CORS middleware to the main app, it covers the mounted API too. The
+    # API only has GET routes and uses no cookies, and browsers may cache
+    # preflight responses for a day.
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins or ["*"],
+        allow_methods=["GET"],
+        allow_headers=["If-None-Match"],
+        max_age=86400,
+    )
+
+    # Add no-cache middleware for development, so changes to the web UI show
+    # up immediately
+    if os.environ.get("HOMEMON_DEV"):
+        app.add_middleware(NoCacheMiddleware)
+
+    # Compress API responses and web UI assets, small ones aren't worth it
+    app.add_middleware(CompressionMiddleware, minimum_size=500, compresslevel=6)
+
+    # Serve the static files
+    static_files = _load_static_files(WEBUI_DIR)
+
+    @app.api_route("/static/{path:path}", methods=["GET", "HEAD"])
+    async def read_static(request: Request, path: str):
+        """Serve a web UI file.
+
+        Browsers may cache the files but have to revalidate them, which costs
+        an empty 304 Not Modified response while the file is unchanged. A
+        single byte range can be requested to resume an interrupted download.
+
+        Args:
+            request (Request): The incoming HTTP request
+            path (str): Path of the file relative to the webui directory
+
+        Returns:
+            Response: The file's content
+
+        Raises:
+            HTTPException: If there is no such file
+        """
+        try:
+            content, media_type, etag = static_files[path]
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Not Found")
+
+        # Ranges only apply while the client's copy is current (If-Range)
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (not if_range or if_range.strip() == etag):
+            try:
+                byte_range = _parse_range(range_header, len(content))
+            except ValueError:
+                return Response(
+                    status_code=416,
+                    headers={"Content-Range": f"bytes */{len(content)}"},
+                )
+            if byte_range:
+                start, end = byte_range
+                return Response(
+                    content[start : end + 1],
+                    status_code=206,
+                    media_type=media_type,
+                    headers={
+                        "Accept-Ranges": "bytes",
+                        "Content-Range": f"bytes {start}-{end}/{len(content)}",
+                        "ETag": etag,
+                    },
+                )
+
+        response = etag_response(request, content, etag, media_type)
+        response.headers["Accept-Ranges"] = "bytes"
+        return response
+
+    # Initialize and mount the API app
+    api_app = init_app(db_path)
+    app.mount("/api", api_app)
+
+    # Mounted apps don't receive lifespan events, so close the API's shared
+    # database connections from the main app
+    app.add_event_handler("shutdown", api_app.state.db.close)
+
+    # Serve index.html at the root path
+    @app.get("/")
+    async def read_root(request: Request):
+        """Serve the main web UI page.
+
+        Args:
+            request (Request): The incoming HTTP request
+
+        Returns:
+            Response: The index.html file from the webui directory
+        """
+        return await read_static(request, "index.html")
+
+    return app
@@ -20,20 +20,75 @@ Example config.yaml:
         alias: "Bedroom"
 """
 
+import copy
+import hashlib
 import logging
+import os
 import yaml
 
+# Prefer the libyaml-backed C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 # Default configuration values
 DEFAULT_POLLING_INTERVAL = 900  # 15 minutes in seconds
 DEFAULT_DB_PATH = "sensor_data.db"
 
+CONFIG_PATH = "config.yaml"
+
+# Parsed configurations keyed by a hash of the file content
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_MAX = 8
+# Path -> ((mtime_ns, size), content hash) of the last file read
+_stat_cache = {}
+
+
+def _parse_config(raw):
+    """Parse configuration file content into the normalized configuration dictionary.
+
+    Args:
+        raw (bytes): Content of the YAML configuration file
+
+    Returns:
+        dict: Configuration dictionary, see load_config()
+    """
+    config = yaml.load(raw, Loader=_Loader)
+
+    # Extract polling interval with default fallback
+    polling_interval = config.get("polling_interval", DEFAULT_POLLING_INTERVAL)
+
+    # Extract database filename with default fallback
+    database_file = config.get("database_file", DEFAULT_DB_PATH)
+
+    # Extract sensors configuration
+    sensors = []
+    sensor_configs = config.get("sensors", [])
+    for sensor in sensor_configs:
+        if "mac_address" in sensor:
+            sensors.append(
+                {
+                    "mac_address": sensor["mac_address"],
+                    "alias": sensor.get("alias", None),
+                }
+            )
+
+    return {
+        "polling_interval": polling_interval,
+        "database_file": database_file,
+        "sensors": sensors,
+    }
+
 
 def load_config():
     """Load configuration from config.yaml file.
 
     This function attempts to load configuration from a config.yaml file in the
     current directory. If the file is not found or contains invalid data, default
-    values are used.
+    values are used. While the file's modification time and size are unchanged
+    repeated calls only cost a stat() call. Otherwise the file is read and only
+    parsed again if its content hash is not cached.
 
     Returns:
         dict: Configuration dictionary containing:
@@ -53,32 +108,27 @@ def load_config():
         Exception: For any other errors (caught and handled)
     """
     try:
-        with open("config.yaml", "r") as f:
-            config = yaml.safe_load(f)
-
-        # Extract polling interval with default fallback
-        polling_interval = config.get("polling_interval", DEFAULT_POLLING_INTERVAL)
-
-        # Extract database filename with default fallback
-        database_file = config.get("database_file", DEFAULT_DB_PATH)
-
-        # Extract sensors configuration
-        sensors = []
-        sensor_configs = config.get("sensors", [])
-        for sensor in sensor_configs:
-            if "mac_address" in sensor:
-                sensors.append(
-                    {
-                        "mac_address": sensor["mac_address"],
-                        "alias": sensor.get("alias", None),
-                    }
-                )
+        st = os.stat(CONFIG_PATH)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        seen = _stat_cache.get(CONFIG_PATH)
+        if seen and seen[0] == stat_key and seen[1] in _CONFIG_CACHE:
+            config = _CONFIG_CACHE[seen[1]]
+        else:
+            # The file may have been touched without changing, hash the content
+            # to decide whether it has to be parsed again
+            with open(CONFIG_PATH, "rb") as f:
+                raw = f.read()
+            digest = hashlib.blake2b(raw, digest_size=16).digest()
+            config = _CONFIG_CACHE.get(digest)
+            if config is None:
+                config = _parse_config(raw)
+                if len(_CONFIG_CACHE) >= _CONFIG_CACHE_MAX:
+                    _CONFIG_CACHE.clear()
+                _CONFIG_CACHE[digest] = config
+            _stat_cache[CONFIG_PATH] = (stat_key, digest)
 
-        return {
-            "polling_interval": polling_interval,
-            "database_file": database_file,
-            "sensors": sensors,
-        }
+        # Copy so callers can't modify the cached configuration
+        return copy.deepcopy(config)
     except FileNotFoundError:
         logging.warning("Config file not found, using default values")
         return {
@@ -87,7 +137,7 @@ def load_config():
             "sensors": [{"mac_address": "A4:C1:38:DE:EA:B9", "alias": None}],
         }
     except Exception as e:
-        logging.error(f"Error loading config: {e}")
+        logging.error("Error loading config: %s", e)
         return {
             "polling_interval": DEFAULT_POLLING_INTERVAL,
             "database_file": DEFAULT_DB_PATH,
@@ -16,17 +16,52 @@ Database Schema:
         - temperature: REAL NOT NULL
         - humidity: INTEGER NOT NULL
         - battery_voltage: REAL NOT NULL
+        - ts_epoch: INTEGER, generated from timestamp (seconds since epoch)
 
 Indexes:
     - idx_measurements_sensor_id: For quick sensor lookups
     - idx_measurements_timestamp: For time-based queries
     - idx_measurements_sensor_timestamp: For combined sensor/time queries
+    - idx_measurements_sensor_epoch: For sensor/time range queries on ts_epoch
 """
 
 import sqlite3
 import logging
 from datetime import datetime
 
+# Stored in PRAGMA user_version, bump when the schema below changes
+SCHEMA_VERSION = 1
+
+# Integer view of the ISO timestamp text, lets range filters compare integers.
+# Timestamps are naive local time, strftime('%s') reads them as if they were UTC.
+_TS_EPOCH_COLUMN = (
+    "ts_epoch INTEGER GENERATED ALWAYS AS "
+    "(CAST(strftime('%s', timestamp) AS INTEGER)) VIRTUAL"
+)
+
+# Statements used on every write, kept as constants and reused verbatim
+_SQL_SELECT_SENSOR = "SELECT id, alias FROM sensors WHERE mac_address = ?"
+_SQL_INSERT_SENSOR = "INSERT INTO sensors (mac_address, alias) VALUES (?, ?)"
+_SQL_UPDATE_ALIAS = "UPDATE sensors SET alias = ? WHERE id = ?"
+_SQL_INSERT_MEASUREMENT = """
+    INSERT INTO measurements (
+        sensor_id, timestamp, temperature, humidity, battery_voltage
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+
+# UPSERT ... RETURNING needs SQLite 3.35, older versions use SELECT + INSERT/UPDATE.
+# The update is unconditional: RETURNING yields no row when DO UPDATE is skipped.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQL_UPSERT_SENSOR = """
+    INSERT INTO sensors (mac_address, alias) VALUES (?, ?)
+    ON CONFLICT(mac_address) DO UPDATE SET alias = excluded.alias
+    RETURNING id
+"""
+
+
+# Write transactions between explicit WAL checkpoints
+CHECKPOINT_INTERVAL = 256
+
 
 class SensorDatabase:
     """Database manager for sensor data storage.
@@ -41,22 +76,49 @@ class SensorDatabase:
     The class can be used as a context manager:
         with SensorDatabase('path/to/db.sqlite') as db:
             db.store_measurement(...)
+
+    Durability:
+        With the default "normal" durability, a committed write survives an
+        application crash, but the most recent commits may be lost on power
+        failure. "fast" durability (synchronous=OFF) never syncs to disk, so
+        recent commits may also be lost if the operating system crashes; the
+        database itself is not corrupted. This is meant for telemetry, where
+        losing the last few readings is acceptable.
     """
 
-    def __init__(self, db_path: str, read_only: bool = False):
+    def __init__(
+        self,
+        db_path: str,
+        read_only: bool = False,
+        check_same_thread: bool = True,
+        durability: str = "normal",
+    ):
         """Initialize database connection and ensure schema exists.
 
         Args:
             db_path (str): Path to the SQLite database file
             read_only (bool, optional): Open database in read-only mode. Defaults to False.
+            check_same_thread (bool, optional): Restrict the connection to the
+                creating thread. Set to False when the caller serializes access
+                from several threads itself. Defaults to True.
+            durability (str, optional): "normal" or "fast", see the class
+                docstring. Defaults to "normal".
 
         Raises:
+            ValueError: If durability is not "normal" or "fast".
             Exception: If database connection fails.
         """
+        if durability not in ("normal", "fast"):
+            raise ValueError(f"Unknown durability: {durability}")
         self.db_path = db_path
         self.conn = None
         self.cursor = None
         self.read_only = read_only
+        self.check_same_thread = check_same_thread
+        self.durability = durability
+        self._writes_since_checkpoint = 0
+        # MAC address -> (sensor ID, alias) of sensors seen by this instance
+        self._sensor_cache = {}
         self._connect()
         if not self.read_only:
             self._init_schema()
@@ -71,17 +133,56 @@ class SensorDatabase:
             if self.read_only:
                 uri = f"file:{self.db_path}?mode=ro"
                 self.conn = sqlite3.connect(
-                    uri, uri=True
+                    uri, uri=True, check_same_thread=self.check_same_thread
                 )  # Open database in read-only mode
             else:
                 self.conn = sqlite3.connect(
-                    self.db_path
+                    self.db_path, check_same_thread=self.check_same_thread
                 )  # Default mode is read-write and create
             self.cursor = self.conn.cursor()
+            if self.read_only:
+                self._configure_reader()
+            else:
+                self._configure()
         except Exception as e:
-            logging.error(f"Failed to connect to database: {e}")
+            logging.error("Failed to connect to database: %s", e)
             raise
 
+    def _configure(self):
+        """Tune the read-write connection for frequent small writes.
+
+        WAL journaling with synchronous=NORMAL only syncs at checkpoints
+        instead of on every commit, and lets API readers run alongside the
+        writer. The journal mode is stored in the database file, so it also
+        applies to later read-only connections. With "fast" durability
+        synchronous is turned off entirely. Failures are logged and the
+        SQLite defaults are kept.
+        """
+        synchronous = "OFF" if self.durability == "fast" else "NORMAL"
+        try:
+            self.cursor.execute("PRAGMA journal_mode=WAL")
+            self.cursor.execute(f"PRAGMA synchronous={synchronous}")
+            self.cursor.execute("PRAGMA temp_store=MEMORY")
+            self.cursor.execute("PRAGMA cache_size=-8000")  # 8 MB
+            self.cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        except sqlite3.Error as e:
+            logging.warning("Failed to configure database connection: %s", e)
+
+    def _configure_reader(self):
+        """Tune a read-only connection for queries running alongside the writer.
+
+        query_only guards against accidental writes and reads go through a
+        memory map. Lock waits use sqlite3's default 5 second timeout rather
+        than failing with "database is locked". Failures are logged and the
+        SQLite defaults are kept.
+        """
+        try:
+            self.cursor.execute("PRAGMA query_only=1")
+            self.cursor.execute("PRAGMA temp_store=MEMORY")
+            self.cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        except sqlite3.Error as e:
+            logging.warning("Failed to configure database connection: %s", e)
+
     def _init_schema(self):
         """Initialize database schema if it doesn't exist.
 
@@ -92,7 +193,14 @@ class SensorDatabase:
 
         The schema is designed to efficiently store and retrieve time-series
         data from multiple sensors.
+
+        The schema version is recorded in ``PRAGMA user_version``; databases
+        already at SCHEMA_VERSION skip the DDL entirely.
         """
+        self.cursor.execute("PRAGMA user_version")
+        if self.cursor.fetchone()[0] == SCHEMA_VERSION:
+            return
+
         # Create sensors table
         self.cursor.execute(
             """
@@ -106,7 +214,7 @@ class SensorDatabase:
 
         # Create measurements table with appropriate indexes
         self.cursor.execute(
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS measurements (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 sensor_id INTEGER NOT NULL,
@@ -114,11 +222,19 @@ class SensorDatabase:
                 temperature REAL NOT NULL,
                 humidity INTEGER NOT NULL,
                 battery_voltage REAL NOT NULL,
+                {_TS_EPOCH_COLUMN},
                 FOREIGN KEY (sensor_id) REFERENCES sensors (id)
             )
         """
         )
 
+        # Databases created before ts_epoch existed get the column added
+        self.cursor.execute("PRAGMA table_xinfo(measurements)")
+        if "ts_epoch" not in {column[1] for column in self.cursor.fetchall()}:
+            self.cursor.execute(
+                f"ALTER TABLE measurements ADD COLUMN {_TS_EPOCH_COLUMN}"
+            )
+
         # Create indexes for common queries
         self.cursor.execute(
             """
@@ -138,7 +254,14 @@ class SensorDatabase:
             ON measurements(sensor_id, timestamp)
         """
         )
+        self.cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_measurements_sensor_epoch
+            ON measurements(sensor_id, ts_epoch)
+        """
+        )
 
+        self.cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         self.conn.commit()
 
     def get_or_create_sensor(self, mac_address: str, alias: str = None) -> int:
@@ -146,7 +269,9 @@ class SensorDatabase:
 
         This method looks up a sensor by MAC address and returns its ID. If the
         sensor doesn't exist, it creates a new entry. If the sensor exists but
-        the alias has changed, it updates the alias.
+        the alias has changed, it updates the alias. On SQLite 3.35+ all three
+        cases are handled by a single UPSERT statement. Results are cached per
+        instance, so repeated calls with the same alias don't query the database.
 
         Args:
             mac_address (str): MAC address of the sensor
@@ -161,10 +286,20 @@ class SensorDatabase:
         if self.read_only:
             raise sqlite3.Error("Cannot modify database in read-only mode.")
 
+        cached = self._sensor_cache.get(mac_address)
+        if cached and cached[1] == alias:
+            return cached[0]
+
+        if _HAS_RETURNING:
+            # Insert, update the alias or just look up the ID in one statement
+            self.cursor.execute(_SQL_UPSERT_SENSOR, (mac_address, alias))
+            sensor_id = self.cursor.fetchone()[0]
+            self.conn.commit()
+            self._sensor_cache[mac_address] = (sensor_id, alias)
+            return sensor_id
+
         # Try to get existing sensor
-        self.cursor.execute(
-            "SELECT id, alias FROM sensors WHERE mac_address = ?", (mac_address,)
-        )
+        self.cursor.execute(_SQL_SELECT_SENSOR, (mac_address,))
         result = self.cursor.fetchone()
 
         if result:
@@ -172,34 +307,37 @@ class SensorDatabase:
             current_alias = result[1]
             # Update alias if it has changed
             if alias != current_alias:
-                self.cursor.execute(
-                    "UPDATE sensors SET alias = ? WHERE id = ?", (alias, sensor_id)
-                )
+                self.cursor.execute(_SQL_UPDATE_ALIAS, (alias, sensor_id))
                 self.conn.commit()
         else:
             # Create new sensor entry
-            self.cursor.execute(
-                "INSERT INTO sensors (mac_address, alias) VALUES (?, ?)",
-                (mac_address, alias),
-            )
+            self.cursor.execute(_SQL_INSERT_SENSOR, (mac_address, alias))
             sensor_id = self.cursor.lastrowid
             self.conn.commit()
 
+        self._sensor_cache[mac_address] = (sensor_id, alias)
         return sensor_id
 
     def store_measurement(
-        self, sensor_id: int, temperature: float, humidity: int, battery_voltage: float
+        self,
+        sensor_id: int,
+        temperature: float,
+        humidity: int,
+        battery_voltage: float,
+        timestamp: str = None,
     ):
         """Store sensor measurement in the database.
 
-        Records a new measurement with the current timestamp. All measurements
-        are associated with a sensor through the sensor_id.
+        Records a new measurement with the given or the current timestamp. All
+        measurements are associated with a sensor through the sensor_id.
 
         Args:
             sensor_id (int): Database ID of the sensor
             temperature (float): Temperature in Celsius
             humidity (int): Relative humidity percentage (0-100)
             battery_voltage (float): Battery voltage in volts
+            timestamp (str, optional): ISO 8601 timestamp of the measurement.
+                Defaults to the current time.
 
         Raises:
             sqlite3.Error: If the insert operation fails
@@ -208,20 +346,50 @@ class SensorDatabase:
         if self.read_only:
             raise sqlite3.Error("Cannot modify database in read-only mode.")
         self.cursor.execute(
-            """
-            INSERT INTO measurements (
-                sensor_id, timestamp, temperature, humidity, battery_voltage
-            ) VALUES (?, ?, ?, ?, ?)
-            """,
+            _SQL_INSERT_MEASUREMENT,
             (
                 sensor_id,
-                datetime.now().isoformat(),
+                timestamp or datetime.now().isoformat(timespec="seconds"),
                 temperature,
                 humidity,
                 battery_voltage,
             ),
         )
         self.conn.commit()
+        self._after_write()
+
+    def store_measurements(self, rows: list):
+        """Store several sensor measurements in a single transaction.
+
+        Inserting a whole polling cycle at once needs a single commit instead
+        of one per measurement.
+
+        Args:
+            rows (list): Tuples of (sensor_id, timestamp, temperature, humidity,
+                battery_voltage), with timestamp as an ISO 8601 string
+
+        Raises:
+            sqlite3.Error: If the insert operation fails
+        """
+        if self.read_only:
+            raise sqlite3.Error("Cannot modify database in read-only mode.")
+        self.cursor.executemany(
+            _SQL_INSERT_MEASUREMENT,
+            rows,
+        )
+        self.conn.commit()
+        self._after_write()
+
+    def _after_write(self):
+        """Run a passive WAL checkpoint every CHECKPOINT_INTERVAL writes.
+
+        Checkpointing at a known pace keeps the WAL file small and, with
+        "fast" durability, bounds how much data lives only in the WAL.
+        """
+        self._writes_since_checkpoint += 1
+        if self._writes_since_checkpoint >= CHECKPOINT_INTERVAL:
+            self._writes_since_checkpoint = 0
+            self.cursor.execute("PRAGMA wal_checkpoint(PASSIVE)")
 
     def close(self):
         """Close database connection.
@@ -254,3 +422,26 @@ class SensorDatabase:
             exc_tb: Exception traceback if an error occurred
         """
         self.close()
+
+
+def upgrade_schema(db_path: str) -> None:
+    """Bring the schema of an existing database up to SCHEMA_VERSION.
+
+    Read-only users of the database, like the API, rely on the current
+    schema (e.g. the ts_epoch column) but can't migrate it themselves. This
+    checks the version with a read-only connection and only opens a
+    short-lived read-write connection if the schema is outdated.
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Raises:
+        sqlite3.Error: If the database can't be opened or migrated
+    """
+    with SensorDatabase(db_path, read_only=True) as db:
+        version = db.conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return
+    logging.info("Upgrading database schema from version %d", version)
+    with SensorDatabase(db_path):
+        pass
@@ -21,7 +21,7 @@ from datetime import datetime
 
 from .database import SensorDatabase
 from .config import load_config
-from .sensors.xiaomi import poll_multiple_sensors
+from .sensors.xiaomi import disconnect_all, iter_sensor_polls
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -32,11 +32,11 @@ async def main():
 
     This asynchronous function manages the continuous monitoring process:
     1. Loads configuration from the config file
-    2. Initializes the SQLite database
+    2. Opens the SQLite database, keeping the connection for the whole run
     3. Enters a continuous loop that:
         - Polls all configured sensors
-        - Prints the sensor readings to console
-        - Stores the readings in the database
+        - Prints the sensor readings to console as they arrive
+        - Stores the readings in the database in a single transaction
         - Waits for the configured polling interval
 
     The function handles both successful readings and error cases for each sensor.
@@ -64,42 +64,54 @@ async def main():
     db_path = config["database_file"]
     sensors = config["sensors"]
 
-    # Initialize database using SensorDatabase class
+    # Open the database once and keep the connection for all polling cycles.
+    # The context manager closes it on any exit, including KeyboardInterrupt
+    # and task cancellation, the finally block does the same for sensors.
     with SensorDatabase(db_path) as db:
-        pass  # The database schema will be initialized in the constructor
-
-    while True:
-        # Poll all sensors and get the data
-        sensor_data_list = await poll_multiple_sensors(sensors)
-
-        # Process the collected data
-        with SensorDatabase(db_path) as db:
-            for sensor_data in sensor_data_list:
-                mac_address = sensor_data.get("mac_address")
-                alias = sensor_data.get("alias")
-                sensor_id = f"{mac_address} ({alias})" if alias else mac_address
-
-                if "error" in sensor_data:
-                    print(f"Error with sensor {sensor_id}: {sensor_data['error']}")
-                else:
-                    # Print the data
-                    print(f"Sensor {sensor_id}:")
-                    print(f"  Temperature: {sensor_data['temperature']} °C")
-                    print(f"  Humidity: {sensor_data['humidity']} %")
-                    print(f"  Battery Voltage: {sensor_data['battery_voltage']} V")
-
-                    # Store the data in the database
-                    db_sensor_id = db.get_or_create_sensor(mac_address, alias)
-                    db.store_measurement(
-                        db_sensor_id,
-                        sensor_data["temperature"],
-                        sensor_data["humidity"],
-                        sensor_data["battery_voltage"],
-                    )
-
-        # Wait for the polling interval before repeating
-        print(f"Waiting for {polling_interval} seconds before polling again...")
-        await asyncio.sleep(polling_interval)
+        try:
+            while True:
+                rows = []
+
+                # Poll all sensors and handle each result as soon as it is ready
+                async for sensor_data in iter_sensor_polls(sensors):
+                    mac_address = sensor_data.get("mac_address")
+                    alias = sensor_data.get("alias")
+                    sensor_id = f"{mac_address} ({alias})" if alias else mac_address
+
+                    if "error" in sensor_data:
+                        print(f"Error with sensor {sensor_id}: {sensor_data['error']}")
+                    else:
+                        # Print the data
+                        print(f"Sensor {sensor_id}:")
+                        print(f"  Temperature: {sensor_data['temperature']} °C")
+                        print(f"  Humidity: {sensor_data['humidity']} %")
+                        print(f"  Battery Voltage: {sensor_data['battery_voltage']} V")
+
+                        # Stamp each reading when it arrives, sensors are polled
+                        # one after another and may take a while
+                        timestamp = datetime.now().isoformat(timespec="seconds")
+                        db_sensor_id = db.get_or_create_sensor(mac_address, alias)
+                        rows.append(
+                            (
+                                db_sensor_id,
+                                timestamp,
+                                sensor_data["temperature"],
+                                sensor_data["humidity"],
+                                sensor_data["battery_voltage"],
+                            )
+                        )
+
+                # Store the whole cycle in one transaction
+                if rows:
+                    db.store_measurements(rows)
+
+                # Wait for the polling interval before repeating
+                print(f"Waiting for {polling_interval} seconds before polling again...")
+                await asyncio.sleep(polling_interval)
+
+        finally:
+            # Close the sensor connections kept open between polls
+            await disconnect_all()
 
 
 # Start the program
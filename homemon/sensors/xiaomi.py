@@ -13,22 +13,63 @@ Sensor Specifications:
         * Battery Voltage: 2.5V - 3.0V
 
 The module implements a robust polling mechanism with:
-    - Automatic retries on failure (up to 3 attempts)
-    - Increasing delay between retries (0s -> 5s -> 10s)
-    - Controlled concurrent polling of multiple sensors
+    - Connections kept open between polls, reconnecting after failures
+    - Automatic retries on failure (up to 5 attempts)
+    - Exponential backoff with full jitter between retries
+    - Circuit breaker skipping persistently failing sensors for a while
+    - Sequential polling of multiple sensors
     - Error handling and logging
 """
 
 import logging
 import asyncio
+import random
+import struct
+import time
 from bleak import BleakClient
+from bleak.exc import BleakError
+
+try:
+    from asyncio import timeout
+except ImportError:  # Python < 3.11
+    from async_timeout import timeout
 
 # Characteristic UUID specific to LYWSD03MMC sensor
 CHAR_UUID = "ebe0ccc1-7a0a-4b0c-8a1a-6ff2997da3a6"
 
-# Global semaphore to control concurrent Bluetooth operations
-# Only allow one Bluetooth operation at a time
-BLE_SEMAPHORE = asyncio.Semaphore(1)
+# Characteristic payload: signed temperature (0.01°C), humidity (%),
+# battery voltage (mV), all little-endian
+_UNPACK = struct.Struct("<hBH").unpack_from
+
+# Pause between polling two sensors, gives the adapter a moment to settle
+POLL_PAUSE = 0.5  # seconds
+
+# Upper bounds for a whole poll attempt (connect + read) and for a single read
+# on a connected sensor, which should finish within a few connection intervals
+READ_TIMEOUT = 25.0  # seconds
+GATT_TIMEOUT = 5.0  # seconds
+
+# Quick retries of a failed characteristic read before reconnecting, the read
+# can fail transiently when it comes before the sensor has new data ready
+READ_RETRIES = 3
+READ_RETRY_DELAY = 0.2  # seconds
+
+# Retry policy for a sensor poll: exponential backoff with full jitter
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0  # seconds
+MAX_DELAY = 30.0  # seconds
+
+# Circuit breaker: after BREAKER_THRESHOLD failed polls in a row a sensor is
+# skipped for a cooldown that doubles with each further failure
+BREAKER_THRESHOLD = 3
+BREAKER_BASE_COOLDOWN = 60.0  # seconds
+BREAKER_MAX_COOLDOWN = 3600.0  # seconds
+
+# MAC address -> (consecutive failed polls, monotonic time until which to skip)
+_failures = {}
+
+# Connected clients kept between polls, keyed by MAC address
+_CLIENTS = {}
 
 
 async def read_sensor_data(client: BleakClient):
@@ -36,10 +77,14 @@ async def read_sensor_data(client: BleakClient):
 
     This function reads the raw data from the sensor's BLE characteristic and
     converts it to human-readable values using the sensor's data format:
-        - Temperature: 2 bytes, little-endian, *0.01 scale
+        - Temperature: 2 bytes, signed little-endian, *0.01 scale
         - Humidity: 1 byte, direct percentage
         - Battery: 2 bytes, little-endian, *0.001 scale
 
+    A read failing with a BleakError on a still connected client is retried up
+    to READ_RETRIES times before giving up, which is much cheaper than the
+    reconnect done by the caller's retries.
+
     Args:
         client (BleakClient): Connected BLE client instance for the sensor
 
@@ -54,10 +99,18 @@ async def read_sensor_data(client: BleakClient):
         Exception: If there's an error reading the characteristic or parsing data
     """
     try:
-        raw_data = await client.read_gatt_char(CHAR_UUID)
-        temperature = (raw_data[0] | (raw_data[1] << 8)) * 0.01
-        humidity = raw_data[2]
-        battery_voltage = (raw_data[3] | (raw_data[4] << 8)) * 0.001
+        for attempt in range(READ_RETRIES):
+            try:
+                async with timeout(GATT_TIMEOUT):
+                    raw_data = await client.read_gatt_char(CHAR_UUID)
+                break
+            except BleakError:
+                if attempt == READ_RETRIES - 1 or not client.is_connected:
+                    raise
+                await asyncio.sleep(READ_RETRY_DELAY)
+        temperature_raw, humidity, battery_raw = _UNPACK(raw_data)
+        temperature = temperature_raw * 0.01
+        battery_voltage = battery_raw * 0.001
 
         return {
             "temperature": temperature,
@@ -66,18 +119,21 @@ async def read_sensor_data(client: BleakClient):
         }
 
     except Exception as e:
-        logging.error(f"Error reading sensor data: {e}")
+        logging.error("Error reading sensor data: %s", e)
         return None
 
 
 async def poll_single_sensor(sensor):
     """Read data from a single LYWSD03MMC sensor with retry mechanism.
 
-    This function attempts to read from a sensor up to 3 times with increasing
-    delays between attempts:
-        1. First attempt: immediate
-        2. Second attempt: after 5 seconds
-        3. Third attempt: after 10 seconds
+    This function attempts to read from a sensor up to MAX_ATTEMPTS times. After
+    a failed attempt it waits a random time between 0 and an exponentially
+    growing limit (1s, 2s, 4s, ... capped at MAX_DELAY), so transient failures
+    are retried quickly and sensors failing together don't retry in lockstep.
+
+    A sensor that failed BREAKER_THRESHOLD polls in a row is not polled at all
+    for a cooldown period, growing exponentially (with jitter) with every
+    further failed poll; an error result is returned right away instead.
 
     Args:
         sensor (dict): Sensor configuration dictionary containing:
@@ -100,30 +156,68 @@ async def poll_single_sensor(sensor):
     mac_address = sensor["mac_address"]
     alias = sensor.get("alias")
 
-    # First attempt
-    result = await try_poll_sensor(mac_address, alias)
-    if not result.get("error"):
-        return result
+    fails, skip_until = _failures.get(mac_address, (0, 0.0))
+    if time.monotonic() < skip_until:
+        return {
+            "mac_address": mac_address,
+            "alias": alias,
+            "error": f"Sensor unavailable after {fails} failed polls, skipping",
+        }
 
-    # Second attempt after 5 seconds
-    logging.info(f"First attempt failed for {mac_address}, retrying in 5 seconds...")
-    await asyncio.sleep(5)
-    result = await try_poll_sensor(mac_address, alias)
-    if not result.get("error"):
-        return result
+    for attempt in range(MAX_ATTEMPTS):
+        result = await try_poll_sensor(mac_address, alias)
+        if not result.get("error"):
+            _failures.pop(mac_address, None)
+            return result
+        if attempt == MAX_ATTEMPTS - 1:
+            _record_failure(mac_address, fails + 1)
+            return result
+
+        # Full jitter: wait a random time up to the exponential backoff delay
+        delay = random.uniform(0, min(BASE_DELAY * 2**attempt, MAX_DELAY))
+        logging.info(
+            "Attempt %d failed for %s, retrying in %.1f seconds...",
+            attempt + 1,
+            mac_address,
+            delay,
+        )
+        await asyncio.sleep(delay)
+
+
+def _record_failure(mac_address: str, fails: int):
+    """Remember a failed poll and open the circuit breaker if needed.
 
-    # Third attempt after 10 seconds
-    logging.info(f"Second attempt failed for {mac_address}, retrying in 10 seconds...")
-    await asyncio.sleep(10)
-    return await try_poll_sensor(mac_address, alias)
+    Args:
+        mac_address (str): The MAC address of the sensor
+        fails (int): Number of consecutive failed polls including this one
+    """
+    skip_until = 0.0
+    if fails >= BREAKER_THRESHOLD:
+        cooldown = min(
+            BREAKER_BASE_COOLDOWN * 2 ** (fails - BREAKER_THRESHOLD),
+            BREAKER_MAX_COOLDOWN,
+        )
+        cooldown *= random.uniform(0.5, 1.5)
+        logging.warning(
+            "Sensor %s failed %d polls in a row, skipping it for %.0f seconds",
+            mac_address,
+            fails,
+            cooldown,
+        )
+        skip_until = time.monotonic() + cooldown
+    _failures[mac_address] = (fails, skip_until)
 
 
 async def try_poll_sensor(mac_address: str, alias: str):
     """Attempt to poll a single LYWSD03MMC sensor.
 
     This function handles a single attempt to connect to and read from a sensor,
-    including connection management and error handling. It uses a semaphore to
-    ensure only one Bluetooth operation occurs at a time.
+    including connection management and error handling. Callers must not poll
+    several sensors concurrently, the adapter handles one operation at a time.
+
+    The connection is kept open for the next poll and only re-established after
+    it dropped or an attempt failed. Call disconnect_all() on shutdown. The
+    whole attempt is limited to READ_TIMEOUT seconds.
 
     Args:
         mac_address (str): The MAC address of the sensor (format: XX:XX:XX:XX:XX:XX)
@@ -143,38 +237,92 @@ async def try_poll_sensor(mac_address: str, alias: str):
                 - error (str): Description of what went wrong
     """
     try:
-        # Use semaphore to ensure only one Bluetooth operation at a time
-        async with BLE_SEMAPHORE:
-            logging.info(f"Connecting to sensor: {mac_address}")
-
-            # Add a small delay between connection attempts to different sensors
-            await asyncio.sleep(0.5)
-
-            async with BleakClient(mac_address, timeout=20.0) as client:
-                logging.info(f"Connected to the sensor: {mac_address}")
-                data = await read_sensor_data(client)
-
-                if data:
-                    return {"mac_address": mac_address, "alias": alias, **data}
-                else:
-                    return {
-                        "mac_address": mac_address,
-                        "alias": alias,
-                        "error": "Failed to read data",
-                    }
-
+        async with timeout(READ_TIMEOUT):
+            client = _CLIENTS.get(mac_address)
+            if client is None or not client.is_connected:
+                logging.info("Connecting to sensor: %s", mac_address)
+                client = BleakClient(mac_address, timeout=20.0)
+                await client.connect()
+                _CLIENTS[mac_address] = client
+                logging.info("Connected to the sensor: %s", mac_address)
+
+            data = await read_sensor_data(client)
+
+        if data:
+            return {"mac_address": mac_address, "alias": alias, **data}
+        else:
+            # Reconnect on the next attempt
+            await _drop_client(mac_address)
+            return {
+                "mac_address": mac_address,
+                "alias": alias,
+                "error": "Failed to read data",
+            }
+
+    except asyncio.TimeoutError:
+        error_msg = f"Timed out after {READ_TIMEOUT} seconds"
+        logging.error("Error with sensor %s: %s", mac_address, error_msg)
+        await _drop_client(mac_address)
+        return {"mac_address": mac_address, "alias": alias, "error": error_msg}
     except Exception as e:
         error_msg = str(e)
-        logging.error(f"Error with sensor {mac_address}: {error_msg}")
+        logging.error("Error with sensor %s: %s", mac_address, error_msg)
+        await _drop_client(mac_address)
         return {"mac_address": mac_address, "alias": alias, "error": error_msg}
 
 
+async def _drop_client(mac_address: str):
+    """Disconnect and forget the cached client of a sensor, if any.
+
+    Args:
+        mac_address (str): The MAC address of the sensor
+    """
+    client = _CLIENTS.pop(mac_address, None)
+    if client is None:
+        return
+    try:
+        await client.disconnect()
+    except Exception as e:
+        logging.warning("Error disconnecting from sensor %s: %s", mac_address, e)
+
+
+async def disconnect_all():
+    """Disconnect all sensor connections kept between polls."""
+    for mac_address in list(_CLIENTS):
+        await _drop_client(mac_address)
+
+
+async def iter_sensor_polls(sensors):
+    """Poll LYWSD03MMC sensors one after another, yielding each result.
+
+    Sensors are polled sequentially in a single coroutine, with a short pause
+    between them, so only one Bluetooth operation occurs at a time and
+    "Operation already in progress" errors are avoided.
+
+    Args:
+        sensors (list): List of sensor configuration dictionaries, see
+            poll_multiple_sensors()
+
+    Yields:
+        dict: Result for each sensor in order, see poll_multiple_sensors()
+    """
+    for i, sensor in enumerate(sensors):
+        if i:
+            await asyncio.sleep(POLL_PAUSE)
+        try:
+            yield await poll_single_sensor(sensor)
+        except Exception as e:
+            yield {
+                "mac_address": sensor["mac_address"],
+                "alias": sensor.get("alias"),
+                "error": str(e),
+            }
+
+
 async def poll_multiple_sensors(sensors):
     """Poll multiple LYWSD03MMC sensors sequentially.
 
-    This function creates tasks to poll multiple sensors, but uses a semaphore
-    to ensure only one Bluetooth operation occurs at a time, preventing
-    "Operation already in progress" errors.
+    Sensors are polled one at a time, see iter_sensor_polls().
 
     Args:
         sensors (list): List of sensor configuration dictionaries, each containing:
@@ -198,25 +346,4 @@ async def poll_multiple_sensors(sensors):
         Even if some sensors fail, results will be returned for all sensors.
         Failed sensors will have an 'error' key in their result dictionary.
     """
-    tasks = []
-    for sensor in sensors:
-        tasks.append(poll_single_sensor(sensor))
-
-    # Create tasks but let the semaphore control actual execution
-    sensor_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    # Convert exceptions to error results
-    processed_results = []
-    for i, result in enumerate(sensor_results):
-        if isinstance(result, Exception):
-            processed_results.append(
-                {
-                    "mac_address": sensors[i]["mac_address"],
-                    "alias": sensors[i].get("alias"),
-                    "error": str(result),
-                }
-            )
-        else:
-            processed_results.append(result)
-
-    return processed_results
+    return [result async for result in iter_sensor_polls(sensors)]
@@ -8,8 +8,13 @@ allowing users to:
     - Manage WiFi connections
 """
 
+import asyncio
+import signal
+
 from telegram.ext import Application, CommandHandler
 
+from .api_client import close_session
+from .utils.graphs import shutdown_graph_workers
 from .config import load_config
 from .commands.help import help_cmd
 from .commands.sensors import recent, average, graphs
@@ -17,14 +22,63 @@ from .commands.system import shutdown, reboot, ota, ping_cmd, restart_homemon, s
 from .commands.wifi import wifi_info, scan_wifi_cmd
 
 
+def _reload_config(application: Application) -> None:
+    """Reload the configuration handlers read from bot_data.
+
+    An invalid configuration file is reported and the previous configuration
+    kept, so a bad edit doesn't take the bot down.
+    """
+    try:
+        application.bot_data["config"] = load_config()
+    except SystemExit:
+        print("Keeping the previous configuration")
+    else:
+        print("Configuration reloaded")
+
+
+async def _post_init(application: Application) -> None:
+    """Reload the configuration on SIGHUP where signal handlers are supported."""
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGHUP, _reload_config, application
+        )
+    except (AttributeError, NotImplementedError):
+        pass
+
+
+async def _post_shutdown(application: Application) -> None:
+    """Release resources shared by the command handlers."""
+    await close_session()
+    shutdown_graph_workers()
+
+
 def create_bot() -> Application:
     """Create and configure the Telegram bot application.
 
+    Installs uvloop as the event loop policy if it is available. The
+    configuration is loaded once into bot_data, where the command handlers
+    read it from, and reloaded when the process receives SIGHUP.
+
     Returns:
         Application: The configured bot application ready to run
     """
+    # Prefer uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     config = load_config()
-    application = Application.builder().token(config["bot_token"]).build()
+    application = (
+        Application.builder()
+        .token(config["bot_token"])
+        .post_init(_post_init)
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
+    application.bot_data["config"] = config
 
     # Register command handlers
     application.add_handler(CommandHandler(["help", "commands"], help_cmd))
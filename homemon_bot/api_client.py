@@ -1,17 +1,67 @@
 """API client for interacting with the Home Monitor API."""
 
+import asyncio
+import time
 import aiohttp
+import ijson
+import orjson
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 API_BASE_URL = "http://localhost:8000/api"
 
+# Give up on API requests that take longer than this, in seconds
+REQUEST_TIMEOUT = 10
 
-async def fetch_data(endpoint: str) -> Any:
+# How long responses are reused, in seconds
+RECENT_TTL = 10
+SENSORS_TTL = 60
+STATS_TTL = 60
+
+# Shared session, keeps connections to the API alive between requests
+_session: Optional[aiohttp.ClientSession] = None
+
+# Endpoint -> (expiry time, future of the decoded response) of cached requests
+_cache: Dict[str, Tuple[float, asyncio.Future]] = {}
+_CACHE_MAX_ENTRIES = 64
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it on first use.
+
+    Returns:
+        The client session
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=8, keepalive_timeout=30, ttl_dns_cache=300
+            ),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared client session, if it was created."""
+    global _session
+    _cache.clear()
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def fetch_data(endpoint: str, ttl: float = 0) -> Any:
     """Fetch data from the Home Monitor API.
 
+    With a ttl the decoded response is reused for that many seconds, and
+    concurrent requests for the same endpoint share a single API request.
+    Cached responses are shared between callers and must not be modified.
+
     Args:
         endpoint: The API endpoint to fetch data from
+        ttl: Seconds to reuse the response for (default: no caching)
 
     Returns:
         The JSON response from the API
@@ -19,9 +69,42 @@ async def fetch_data(endpoint: str) -> Any:
     Raises:
         Exception: If there's an error fetching data from the API
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.get(f"{API_BASE_URL}/{endpoint}") as response:
-            return await response.json()
+    if not ttl:
+        return await _fetch(endpoint)
+
+    now = time.monotonic()
+    entry = _cache.get(endpoint)
+    if entry is not None and now < entry[0]:
+        # Shielded so a cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(entry[1])
+
+    if len(_cache) >= _CACHE_MAX_ENTRIES:
+        for key in [k for k, (expires, _) in _cache.items() if expires <= now]:
+            del _cache[key]
+        if len(_cache) >= _CACHE_MAX_ENTRIES:
+            _cache.clear()
+
+    future = asyncio.ensure_future(_fetch(endpoint))
+    _cache[endpoint] = (now + ttl, future)
+    try:
+        return await asyncio.shield(future)
+    except Exception:
+        # Don't keep failures around, the next call retries
+        if _cache.get(endpoint, (0, None))[1] is future:
+            del _cache[endpoint]
+        raise
+
+
+async def _fetch(endpoint: str) -> Any:
+    """Request an API endpoint and decode its JSON response.
+
+    Raises:
+        aiohttp.ClientResponseError: If the API responds with an error status
+    """
+    session = await _get_session()
+    async with session.get(f"{API_BASE_URL}/{endpoint}") as response:
+        response.raise_for_status()
+        return orjson.loads(await response.read())
 
 
 async def get_recent_measurements() -> List[Dict[str, Any]]:
@@ -30,7 +113,7 @@ async def get_recent_measurements() -> List[Dict[str, Any]]:
     Returns:
         List of measurement dictionaries
     """
-    return await fetch_data("measurements/recent")
+    return await fetch_data("measurements/recent", ttl=RECENT_TTL)
 
 
 async def get_sensors() -> List[Dict[str, Any]]:
@@ -39,40 +122,63 @@ async def get_sensors() -> List[Dict[str, Any]]:
     Returns:
         List of sensor dictionaries
     """
-    return await fetch_data("sensors")
+    return await fetch_data("sensors", ttl=SENSORS_TTL)
 
 
-async def get_sensor_stats(
-    sensor_id: int, start_time: datetime, end_time: datetime
-) -> Dict[str, float]:
-    """Get statistics for a specific sensor over a time period.
+async def get_sensors_stats(
+    sensor_ids: List[int], start_time: datetime, end_time: datetime
+) -> Dict[int, Dict[str, float]]:
+    """Get statistics of several sensors over a time period at once.
 
     Args:
-        sensor_id: The ID of the sensor
+        sensor_ids: IDs of the sensors
         start_time: Start of the time period
         end_time: End of the time period
 
     Returns:
-        Dictionary containing average temperature and humidity
+        Dictionary mapping sensor IDs to their statistics, sensors without
+        measurements in the time period are left out
     """
-    return await fetch_data(
-        f"measurements/{sensor_id}/stats?start_time={start_time.isoformat()}&end_time={end_time.isoformat()}"
+    ids = ",".join(map(str, sensor_ids))
+    stats = await fetch_data(
+        f"measurements/stats?sensor_ids={ids}&start_time={start_time.isoformat()}&end_time={end_time.isoformat()}",
+        ttl=STATS_TTL,
     )
+    return {item["sensor_id"]: item for item in stats}
 
 
-async def get_sensor_measurements(
-    sensor_id: int, start_time: datetime, end_time: datetime
-) -> List[Dict[str, Any]]:
-    """Get measurements for a specific sensor over a time period.
+async def stream_sensors_measurements(
+    sensor_ids: List[int], start_time: datetime, end_time: datetime
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream measurements of several sensors over a time period.
+
+    All sensors are fetched with a single API request. The response is
+    parsed incrementally while it is received, so the raw response body is
+    never buffered in full. Long downloads are allowed as long as data keeps
+    arriving.
 
     Args:
-        sensor_id: The ID of the sensor
+        sensor_ids: IDs of the sensors
         start_time: Start of the time period
         end_time: End of the time period
 
-    Returns:
-        List of measurement dictionaries
+    Yields:
+        Measurement dictionaries including their sensor_id, ordered by sensor
+        and time
+
+    Raises:
+        aiohttp.ClientResponseError: If the API responds with an error status
     """
-    return await fetch_data(
-        f"measurements/{sensor_id}?start_time={start_time.isoformat()}&end_time={end_time.isoformat()}"
-    )
+    session = await _get_session()
+    params = {
+        "sensor_ids": ",".join(map(str, sensor_ids)),
+        "start_time": start_time.isoformat(),
+        "end_time": end_time.isoformat(),
+    }
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=REQUEST_TIMEOUT)
+    async with session.get(
+        f"{API_BASE_URL}/measurements", params=params, timeout=timeout
+    ) as response:
+        response.raise_for_status()
+        async for item in ijson.items_async(response.content, "item", use_float=True):
+            yield item
@@ -2,10 +2,11 @@
 
 from telegram import Update
 from telegram.ext import ContextTypes
-from ..config import load_config, is_authorized
+from ..config import require_auth
 
 
-async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@require_auth
+async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /help and /commands - show available commands.
 
     Displays a list of all available commands and their descriptions.
@@ -13,12 +14,8 @@ async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     help_text = """Available homemon commands:
 /recent - Shows latest measurements from all sensors
 /average [hours] - Displays average values over specified hours (default: 24h)
@@ -1,19 +1,46 @@
 """Sensor data command handlers."""
 
+import asyncio
+import time
 from datetime import datetime, timedelta
-from telegram import Update
+from typing import Dict, FrozenSet, List, Tuple
+from telegram import InputMediaPhoto, Update
 from telegram.ext import ContextTypes
-from ..config import load_config, is_authorized
+from ..config import require_auth
 from ..api_client import (
     get_recent_measurements,
     get_sensors,
-    get_sensor_stats,
-    get_sensor_measurements,
+    get_sensors_stats,
+    stream_sensors_measurements,
 )
 from ..utils.graphs import generate_graphs
 
+# How long rendered /graphs images are reused for the same time range, in
+# seconds. Sensors only report every few minutes.
+GRAPHS_TTL = 60
 
-async def recent(update: Update, context: ContextTypes.DEFAULT_TYPE):
+# Hours -> (expiry time, ids of sensors with data, PNG images) of /graphs
+_graphs_cache: Dict[int, Tuple[float, FrozenSet[int], List[bytes]]] = {}
+_GRAPHS_CACHE_MAX_ENTRIES = 8
+
+
+def _fmt_ts(timestamp: str) -> str:
+    """Format an ISO 8601 timestamp as "YYYY.MM.DD  HH:MM:SS".
+
+    The API returns timestamps as ISO strings, so the fields are sliced out
+    directly instead of parsing them into a datetime.
+
+    Args:
+        timestamp: ISO 8601 timestamp, e.g. "2024-01-31T12:34:56.789"
+
+    Returns:
+        str: The formatted timestamp
+    """
+    return f"{timestamp[0:4]}.{timestamp[5:7]}.{timestamp[8:10]}  {timestamp[11:19]}"
+
+
+@require_auth
+async def recent(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /recent command - show latest measurements.
 
     Retrieves and displays the most recent measurements from all sensors.
@@ -21,40 +48,39 @@ async def recent(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     try:
-        # Get sensors first to have access to aliases
-        sensors = {s["id"]: s for s in await get_sensors()}
-        measurements = await get_recent_measurements()
+        # Get sensors for their aliases together with the measurements
+        sensors_list, measurements = await asyncio.gather(
+            get_sensors(), get_recent_measurements()
+        )
+        sensors = {s["id"]: s for s in sensors_list}
+        names = {
+            sensor_id: s.get("alias") or s.get("mac_address", str(sensor_id))
+            for sensor_id, s in sensors.items()
+        }
 
         # Format response message
         response = []
         for m in measurements:
-            nice_timestamp = datetime.fromisoformat(m["timestamp"]).strftime(
-                "%Y.%m.%d  %H:%M:%S"
+            nice_timestamp = _fmt_ts(m["timestamp"])
+            sensor_name = names.get(m["sensor_id"]) or str(m["sensor_id"])
+            response.append(
+                f"*{sensor_name}*:\n"
+                f"🌡️ Temperature: {m['temperature']}°C\n"
+                f"💧 Humidity: {m['humidity']}%\n"
+                f"🔋 Battery: {m['battery_voltage']}V\n"
+                f"🕒 Last update: {nice_timestamp}"
             )
-            sensor = sensors.get(m["sensor_id"], {})
-            sensor_name = sensor.get("alias") or sensor.get(
-                "mac_address", str(m["sensor_id"])
-            )
-            sensor_info = f"*{sensor_name}*:\n"
-            sensor_info += f"🌡️ Temperature: {m['temperature']}°C\n"
-            sensor_info += f"💧 Humidity: {m['humidity']}%\n"
-            sensor_info += f"🔋 Battery: {m['battery_voltage']}V\n"
-            sensor_info += f"🕒 Last update: {nice_timestamp}"
-            response.append(sensor_info)
 
         await update.message.reply_text("\n\n".join(response), parse_mode="Markdown")
     except Exception as e:
         await update.message.reply_text(f"Error fetching data: {str(e)}")
 
 
-async def average(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@require_auth
+async def average(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /average command - show average measurements.
 
     Calculates and displays average values for each sensor over the specified
@@ -63,12 +89,8 @@ async def average(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     # Get hours from command or use default
     hours = 24
     if context.args:
@@ -83,8 +105,9 @@ async def average(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
 
     try:
-        # Calculate time range
-        end_time = datetime.now()
+        # Calculate time range in whole minutes, so repeated requests within a
+        # minute share the cached API responses
+        end_time = datetime.now().replace(second=0, microsecond=0)
         start_time = end_time - timedelta(hours=hours)
 
         # Get all sensors
@@ -93,36 +116,31 @@ async def average(update: Update, context: ContextTypes.DEFAULT_TYPE):
             await update.message.reply_text("No sensors found in the system.")
             return
 
+        # Get stats for all sensors with a single request, they include the
+        # number of measurements so the measurements themselves aren't needed
+        all_stats = await get_sensors_stats(
+            [sensor["id"] for sensor in sensors], start_time, end_time
+        )
+
         response = []
         no_data_sensors = []
         for sensor in sensors:
-            try:
-                # Get stats and measurements for each sensor
-                stats = await get_sensor_stats(sensor["id"], start_time, end_time)
-                measurements = await get_sensor_measurements(
-                    sensor["id"], start_time, end_time
-                )
-                measurement_count = len(measurements)
-
-                if (
-                    stats["average_temperature"] is None
-                    or stats["average_humidity"] is None
-                ):
-                    no_data_sensors.append(sensor.get("alias") or sensor["mac_address"])
-                    continue
-
-                sensor_name = sensor.get("alias") or sensor["mac_address"]
-                sensor_info = f"*{sensor_name}*:\n"
-                sensor_info += (
-                    f"🌡️ Average Temperature: {stats['average_temperature']:.1f}°C\n"
-                )
-                sensor_info += (
-                    f"💧 Average Humidity: {stats['average_humidity']:.1f}%\n"
-                )
-                sensor_info += f"#️⃣ Number of measurements: {measurement_count}"
-                response.append(sensor_info)
-            except Exception:
-                no_data_sensors.append(sensor.get("alias") or sensor["mac_address"])
+            sensor_name = sensor.get("alias") or sensor["mac_address"]
+            stats = all_stats.get(sensor["id"])
+            if (
+                stats is None
+                or stats["average_temperature"] is None
+                or stats["average_humidity"] is None
+            ):
+                no_data_sensors.append(sensor_name)
+                continue
+
+            response.append(
+                f"*{sensor_name}*:\n"
+                f"🌡️ Average Temperature: {stats['average_temperature']:.1f}°C\n"
+                f"💧 Average Humidity: {stats['average_humidity']:.1f}%\n"
+                f"#️⃣ Number of measurements: {stats['count']}"
+            )
 
         if not response and no_data_sensors:
             time_range = f"last {hours} hour{'s' if hours != 1 else ''}"
@@ -134,11 +152,13 @@ async def average(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             return
 
-        message = f"Averages over last {hours}h:\n\n" + "\n\n".join(response)
+        parts = [f"Averages over last {hours}h:", *response]
         if no_data_sensors:
-            message += f"\n\nNote: No data available for sensor{'s' if len(no_data_sensors) > 1 else ''} *{', '.join(no_data_sensors)}* in this time period."
+            parts.append(
+                f"Note: No data available for sensor{'s' if len(no_data_sensors) > 1 else ''} *{', '.join(no_data_sensors)}* in this time period."
+            )
 
-        await update.message.reply_text(message, parse_mode="Markdown")
+        await update.message.reply_text("\n\n".join(parts), parse_mode="Markdown")
 
     except Exception as e:
         await update.message.reply_text(
@@ -147,7 +167,8 @@ async def average(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
 
 
-async def graphs(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@require_auth
+async def graphs(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /graphs command - generate measurement graphs.
 
     Generates and sends three graphs showing temperature, humidity, and battery
@@ -156,12 +177,8 @@ async def graphs(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     # Get hours from command or use default
     hours = 24
     if context.args:
@@ -176,32 +193,34 @@ async def graphs(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
 
     try:
-        # Calculate time range
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=hours)
-
-        # Get all sensors
-        sensors = {s["id"]: s for s in await get_sensors()}
-        if not sensors:
+        # Get all sensors, only their display names are needed
+        sensors = await get_sensors()
+        names = {s["id"]: s.get("alias") or s["mac_address"] for s in sensors}
+        if not names:
             await update.message.reply_text("No sensors found in the system.")
             return
 
-        # Collect measurements for each sensor
-        all_measurements = []
-        sensors_with_data = set()
-        no_data_sensors = []
-
-        for sensor_id, sensor in sensors.items():
-            measurements = await get_sensor_measurements(
-                sensor_id, start_time, end_time
-            )
-            if measurements:
-                all_measurements.extend(
-                    [{**m, "sensor_id": sensor_id} for m in measurements]
-                )
-                sensors_with_data.add(sensor.get("alias") or sensor["mac_address"])
-            else:
-                no_data_sensors.append(sensor.get("alias") or sensor["mac_address"])
+        # Reuse recently rendered graphs of the same time range, otherwise
+        # they are generated once the sensors with data are known
+        now = time.monotonic()
+        cached = _graphs_cache.get(hours)
+        if cached is not None and now < cached[0]:
+            _, ids_with_data, images = cached
+        else:
+            # Stream measurements of all sensors with a single request
+            end_time = datetime.now()
+            start_time = end_time - timedelta(hours=hours)
+            stream = stream_sensors_measurements(list(names), start_time, end_time)
+            all_measurements = [m async for m in stream]
+            ids_with_data = frozenset(m["sensor_id"] for m in all_measurements)
+            images = None
+
+        sensors_with_data = {
+            name for sensor_id, name in names.items() if sensor_id in ids_with_data
+        }
+        no_data_sensors = [
+            name for sensor_id, name in names.items() if sensor_id not in ids_with_data
+        ]
 
         # Handle case where no sensors have data
         if not sensors_with_data:
@@ -224,10 +243,23 @@ async def graphs(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 parse_mode="Markdown",
             )
 
-        # Generate and send graphs for sensors that have data
-        graph_buffers = await generate_graphs(all_measurements, hours)
-        for buf in graph_buffers:
-            await update.message.reply_photo(photo=buf)
+        # Generate graphs for sensors that have data
+        if images is None:
+            graph_buffers = await generate_graphs(all_measurements, hours)
+            images = [buf.getvalue() for buf in graph_buffers]
+
+            # Drop expired entries, and the oldest one if still full
+            for key, entry in list(_graphs_cache.items()):
+                if entry[0] <= now:
+                    del _graphs_cache[key]
+            if len(_graphs_cache) >= _GRAPHS_CACHE_MAX_ENTRIES:
+                del _graphs_cache[next(iter(_graphs_cache))]
+            _graphs_cache[hours] = (now + GRAPHS_TTL, ids_with_data, images)
+
+        # Send them as one album, a single upload that keeps them in order
+        await update.message.reply_media_group(
+            media=[InputMediaPhoto(image) for image in images]
+        )
 
     except Exception as e:
         await update.message.reply_text(
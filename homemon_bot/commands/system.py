@@ -1,14 +1,56 @@
 """System-related command handlers."""
 
-import subprocess
+import asyncio
 import re
+import subprocess
+import time
+from typing import Dict, List, Optional
 from telegram import Update
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes
-from ..config import load_config, is_authorized
-from ..utils.system import perform_git_pull, ping_address, get_wifi_info
+from ..config import require_auth
+from ..utils.system import (
+    WifiError,
+    default_gateway,
+    get_wifi_info,
+    perform_git_pull,
+    ping_address,
+    run_command,
+)
+
+# Minimum seconds between edits of the /ping reply, Telegram rate-limits edits
+PING_EDIT_INTERVAL = 2.0
+
+# Service names may only contain alphanumerics, hyphens and underscores.
+# \Z rather than $ so a trailing newline doesn't slip through.
+_SERVICE_RE = re.compile(r"^[a-zA-Z0-9_-]+\Z")
+
+# Service names containing the name of a shell or command are rejected. The
+# character check already rules out any shell metacharacters.
+_SUSPICIOUS_RE = re.compile("bash|sh|cmd|exec|eval|sudo")
+
+# Names of service units mentioned in systemctl's error messages
+_UNIT_RE = re.compile(r"[\w:.@-]+\.service\b")
 
 
-async def shutdown(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def _run_power_command(update: Update, *args: str):
+    """Run a shutdown or reboot command and report if it failed.
+
+    Args:
+        update: The update object from Telegram
+        *args: The command and its arguments
+    """
+    try:
+        await run_command(*args)
+    except subprocess.CalledProcessError as e:
+        error = e.stderr.decode().strip() or f"exit status {e.returncode}"
+        await update.message.reply_text(f"❌ Command failed: {error}")
+    except OSError as e:
+        await update.message.reply_text(f"❌ Command failed: {e}")
+
+
+@require_auth
+async def shutdown(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /shutdown command - shutdown the system.
 
     Initiates a system shutdown using the shutdown command.
@@ -16,17 +58,14 @@ async def shutdown(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     await update.message.reply_text("Shutting down the system...")
-    subprocess.run(["sudo", "shutdown", "-h", "now"])
+    await _run_power_command(update, "sudo", "shutdown", "-h", "now")
 
 
-async def reboot(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@require_auth
+async def reboot(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /reboot command - reboot the system.
 
     Initiates a system reboot using the reboot command.
@@ -34,17 +73,14 @@ async def reboot(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     await update.message.reply_text("Rebooting the system...")
-    subprocess.run(["sudo", "reboot"])
+    await _run_power_command(update, "sudo", "reboot")
 
 
-async def ota(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@require_auth
+async def ota(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /ota command - update code from git repository.
 
     Performs a git pull operation in the current directory to update the code.
@@ -52,103 +88,126 @@ async def ota(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     result = await perform_git_pull()
     await update.message.reply_text(result)
 
 
-async def ping_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@require_auth
+async def ping_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
     """Handle /ping command - ping a network address.
 
-    Pings the specified address or the gateway if no address is provided.
+    Pings the specified address or the default gateway if no address is
+    provided.
+    A placeholder reply is sent immediately and replaced by the ping output,
+    which is updated at most every PING_EDIT_INTERVAL seconds while ping runs.
 
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     # Get gateway if no address specified
-    address = context.args[0] if context.args else (await get_wifi_info())["gateway"]
-    result = await ping_address(address)
-    await update.message.reply_text(result)
+    if context.args:
+        address = context.args[0]
+    else:
+        try:
+            address = default_gateway()
+        except OSError:
+            # No procfs, fall back to the WiFi connection details
+            try:
+                address = (await get_wifi_info())["gateway"]
+            except WifiError as e:
+                await update.message.reply_text(str(e))
+                return
+        if not address:
+            await update.message.reply_text("No default gateway found")
+            return
+    # Acknowledge right away, the pings take a second each
+    message = await update.message.reply_text(f"Pinging {address}...")
+    shown = None
+    last_edit = 0.0
+
+    async def show_output(output: str):
+        """Edit the replies into the message as they arrive, rate-limited."""
+        nonlocal shown, last_edit
+        now = time.monotonic()
+        if now - last_edit < PING_EDIT_INTERVAL:
+            return
+        last_edit = now
+        try:
+            await message.edit_text(output)
+            shown = output
+        except TelegramError:
+            # Progress is best effort, the final output is edited in below
+            pass
 
+    result = await ping_address(address, on_output=show_output)
+    if result != shown:
+        await message.edit_text(result)
 
-async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /status command - show system status information.
 
-    Displays system uptime, memory usage, disk usage, and CPU temperature.
+async def _command_status(
+    *args: str, failed: str, unavailable: Optional[str] = None
+) -> str:
+    """Run a command for /status and return its output or a message.
 
     Args:
-        update: The update object from Telegram
-        context: The context object from Telegram
-    """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
+        *args: The command and its arguments
+        failed: Message to show if the command can't be run
+        unavailable: Message to show if the command is not installed or exits
+            with an error (default: the failed message)
 
-    status_text = []
-
-    # System Uptime
-    status_text.append("System Uptime:")
+    Returns:
+        str: The command's stripped standard output, or the message
+    """
     try:
-        result = subprocess.run(["uptime"], capture_output=True, text=True)
-        if result.returncode == 0:
-            status_text.append(result.stdout.strip())
-        else:
-            status_text.append("Unable to get uptime")
-    except Exception:
-        status_text.append("Unable to get uptime")
-    status_text.append("")
+        return (await run_command(*args, stderr=asyncio.subprocess.DEVNULL)).strip()
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return unavailable or failed
+    except OSError:
+        return failed
 
-    # Memory Usage
-    status_text.append("Memory Usage:")
-    try:
-        result = subprocess.run(["free", "-h"], capture_output=True, text=True)
-        if result.returncode == 0:
-            status_text.append(result.stdout.strip())
-        else:
-            status_text.append("Unable to get memory usage")
-    except Exception:
-        status_text.append("Unable to get memory usage")
-    status_text.append("")
 
-    # Disk Usage
-    status_text.append("Disk Usage:")
-    try:
-        result = subprocess.run(["df", "-h"], capture_output=True, text=True)
-        if result.returncode == 0:
-            status_text.append(result.stdout.strip())
-        else:
-            status_text.append("Unable to get disk usage")
-    except Exception:
-        status_text.append("Unable to get disk usage")
-    status_text.append("")
+@require_auth
+async def status(update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict):
+    """Handle /status command - show system status information.
 
-    # CPU Temperature (only on Raspberry Pi)
-    status_text.append("CPU Temperature:")
-    try:
-        result = subprocess.run(
-            ["vcgencmd", "measure_temp"], capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            status_text.append(result.stdout.strip())
-        else:
-            status_text.append("CPU temperature not available (not a Raspberry Pi)")
-    except FileNotFoundError:
-        status_text.append("CPU temperature not available (not a Raspberry Pi)")
-    except Exception:
-        status_text.append("Unable to get CPU temperature")
+    Displays system uptime, memory usage, disk usage, and CPU temperature.
+    The commands providing them run concurrently.
 
+    Args:
+        update: The update object from Telegram
+        context: The context object from Telegram
+        config: The bot configuration
+    """
+    uptime, memory, disk, cpu_temp = await asyncio.gather(
+        _command_status("uptime", failed="Unable to get uptime"),
+        _command_status("free", "-h", failed="Unable to get memory usage"),
+        _command_status("df", "-h", failed="Unable to get disk usage"),
+        # Only available on a Raspberry Pi
+        _command_status(
+            "vcgencmd",
+            "measure_temp",
+            failed="Unable to get CPU temperature",
+            unavailable="CPU temperature not available (not a Raspberry Pi)",
+        ),
+    )
+
+    status_text = [
+        "System Uptime:",
+        uptime,
+        "",
+        "Memory Usage:",
+        memory,
+        "",
+        "Disk Usage:",
+        disk,
+        "",
+        "CPU Temperature:",
+        cpu_temp,
+    ]
     await update.message.reply_text("\n".join(status_text))
 
 
@@ -159,7 +218,7 @@ def is_valid_service_name(service: str) -> bool:
     - Contains only alphanumeric characters, hyphens, and underscores
     - Has a reasonable length
     - Doesn't contain any shell special characters or spaces
-    - Doesn't contain any command injection attempts
+    - Doesn't contain the name of a shell or privileged command
 
     Args:
         service: Name of the service to validate
@@ -173,39 +232,21 @@ def is_valid_service_name(service: str) -> bool:
 
     # Only allow alphanumeric characters, hyphens, and underscores
     # This automatically prevents shell command injection
-    if not re.match(r"^[a-zA-Z0-9_-]+$", service):
+    if not _SERVICE_RE.match(service):
         return False
 
-    # Additional checks for common command injection patterns
-    suspicious_patterns = [
-        "&&",
-        "||",
-        "|",
-        ";",
-        ">",
-        "<",
-        "`",
-        "$",
-        "(",
-        ")",
-        "bash",
-        "sh",
-        "cmd",
-        "exec",
-        "eval",
-        "sudo",
-    ]
-
-    service_lower = service.lower()
-    if any(pattern in service_lower for pattern in suspicious_patterns):
+    if _SUSPICIOUS_RE.search(service.lower()):
         return False
 
     return True
 
 
-def service_exists(service: str) -> bool:
+async def service_exists(service: str) -> bool:
     """Check if a systemd service exists.
 
+    Asks systemd for the unit's load state, so units from any unit directory
+    or generator are found, while masked units don't count as existing.
+
     Args:
         service: Name of the service to check
 
@@ -213,23 +254,18 @@ def service_exists(service: str) -> bool:
         bool: True if the service exists, False otherwise
     """
     try:
-        # Use systemctl status without sudo to check if service exists
-        subprocess.run(
-            ["systemctl", "status", service],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True,
+        load_state = await run_command(
+            "systemctl", "show", "-p", "LoadState", "--value", f"{service}.service"
         )
-        return True
-    except subprocess.CalledProcessError as e:
-        # Return code 3 means service exists but is stopped
-        # Return code 4 means service exists but has never been started
-        return e.returncode in [3, 4]
-    except Exception:
+    except (OSError, subprocess.CalledProcessError):
         return False
+    return load_state.strip() == "loaded"
 
 
-async def restart_homemon(update: Update, context: ContextTypes.DEFAULT_TYPE):
+@require_auth
+async def restart_homemon(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, config: dict
+):
     """Handle /restart_homemon command - restart configured homemon services.
 
     Restarts the systemd services specified in the config.telegram.yaml file.
@@ -237,16 +273,15 @@ async def restart_homemon(update: Update, context: ContextTypes.DEFAULT_TYPE):
     Before attempting to restart a service:
     - Validates the service name for safety
     - Verifies it exists to prevent potential command injection attacks
+    All valid services are restarted with a single systemctl call. Each is
+    reported as restarted unless systemctl failed for it or its last run
+    didn't succeed. The bot's own service is restarted last.
 
     Args:
         update: The update object from Telegram
         context: The context object from Telegram
+        config: The bot configuration
     """
-    config = load_config()
-    if not is_authorized(update.effective_chat.id, config):
-        await update.message.reply_text("You are not authorized to use this bot.")
-        return
-
     services = config.get("services_to_restart", [])
     if not services:
         await update.message.reply_text(
@@ -254,22 +289,131 @@ async def restart_homemon(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
+    # First validate the service names
+    named = []
     for service in services:
-        # First validate the service name
-        if not is_valid_service_name(service):
+        if is_valid_service_name(service):
+            named.append(service)
+        else:
             await update.message.reply_text(f"❌ Invalid service name: {service}")
-            continue
 
-        # Then verify the service exists without sudo
-        if not service_exists(service):
+    # Then verify the services exist without sudo, all at once
+    exists = await asyncio.gather(*(service_exists(service) for service in named))
+    valid = []
+    for service, found in zip(named, exists):
+        if found:
+            valid.append(service)
+        else:
             await update.message.reply_text(f"❌ Service {service} does not exist")
-            continue
 
-        # Only attempt to restart if service exists and name is valid
+    if not valid:
+        return
+
+    # The bot's own service is restarted last, without waiting for it, since
+    # the restart ends this process
+    own_unit = _own_unit()
+    own = [service for service in valid if f"{service}.service" == own_unit]
+    others = [service for service in valid if service not in own]
+
+    if others:
+        # Only restart services that exist and have valid names, all in one call
+        proc = await asyncio.create_subprocess_exec(
+            "sudo",
+            "systemctl",
+            "restart",
+            *others,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, err = await proc.communicate()
+        errors = err.decode().strip()
+        error_units = set(_UNIT_RE.findall(errors))
+
+        # A unit failed if its last run didn't succeed or systemctl names it in
+        # its errors. Oneshot units are inactive after a successful run.
         try:
-            subprocess.run(["sudo", "systemctl", "restart", service], check=True)
+            states = await _unit_states(others)
+        except (OSError, subprocess.CalledProcessError):
+            states = {}
+        failed = [
+            service
+            for service in others
+            if states.get(service, {}).get("Result") != "success"
+            or states[service].get("ActiveState") == "failed"
+            or f"{service}.service" in error_units
+        ]
+        if proc.returncode != 0 and not failed:
+            failed = others
+
+        for service in others:
+            if service not in failed:
+                await update.message.reply_text(
+                    f"✅ Service {service} restarted successfully"
+                )
+            elif errors:
+                await update.message.reply_text(
+                    f"❌ Failed to restart service {service}: {errors}"
+                )
+            else:
+                await update.message.reply_text(
+                    f"❌ Failed to restart service {service}"
+                )
+
+    for service in own:
+        await update.message.reply_text(
+            f"♻️ Restarting service {service}, the bot will be back shortly"
+        )
+        try:
+            await run_command("sudo", "systemctl", "restart", "--no-block", service)
+        except subprocess.CalledProcessError as e:
+            error = e.stderr.decode().strip() or f"exit status {e.returncode}"
+            await update.message.reply_text(
+                f"❌ Failed to restart service {service}: {error}"
+            )
+        except OSError as e:
             await update.message.reply_text(
-                f"✅ Service {service} restarted successfully"
+                f"❌ Failed to restart service {service}: {e}"
             )
-        except subprocess.CalledProcessError:
-            await update.message.reply_text(f"❌ Failed to restart service {service}")
+
+
+def _own_unit() -> Optional[str]:
+    """Find the systemd unit the bot runs in.
+
+    Returns:
+        str: Name of the unit from the process's cgroup, e.g.
+            "homemon-bot.service", or None if it can't be determined
+    """
+    try:
+        with open("/proc/self/cgroup") as f:
+            cgroups = f.read()
+    except OSError:
+        return None
+    for line in cgroups.splitlines():
+        for part in reversed(line.rpartition(":")[2].split("/")):
+            if part.endswith(".service"):
+                return part
+    return None
+
+
+async def _unit_states(services: List[str]) -> Dict[str, Dict[str, str]]:
+    """Get the active state and result of the last run of services.
+
+    Args:
+        services: Names of the services
+
+    Returns:
+        dict: Maps each service name to its ActiveState and Result properties
+
+    Raises:
+        subprocess.CalledProcessError: If systemctl failed
+    """
+    units = [f"{service}.service" for service in services]
+    output = await run_command("systemctl", "show", "-p", "ActiveState,Result", *units)
+
+    # The properties of each unit form a block, in the order given
+    states = {}
+    for service, block in zip(services, output.strip().split("\n\n")):
+        states[service] = dict(
+            line.split("=", 1) for line in block.splitlines() if "=" in line
+        )
+    return states
@@ -4,27 +4,81 @@ This module provides functionality to load and validate the bot's configuration
 from the config.telegram.yaml file.
 """
 
+import hashlib
 import os
 import sys
+import threading
+import orjson
 import yaml
-from typing import Dict, List, Union
+from functools import wraps
+from typing import Dict, FrozenSet, Union
 
+# Prefer the libyaml-backed C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
-def load_config() -> Dict[str, Union[str, List[int]]]:
+CONFIG_PATH = "config.telegram.yaml"
+
+# Last loaded configuration and the (mtime_ns, size) of the file it came from
+_cached = None
+_cached_stat = None
+_cache_lock = threading.Lock()
+
+
+def load_config() -> Dict[str, Union[str, FrozenSet[int]]]:
     """Load and validate the Telegram bot configuration.
 
     This function reads the config.telegram.yaml file and validates its contents
-    to ensure all required fields are present and properly formatted.
+    to ensure all required fields are present and properly formatted. The result
+    is cached and only reloaded when the file's modification time or size
+    changes, so callers must not modify the returned dictionary.
 
     Returns:
         dict: The configuration dictionary containing bot_token and allowed_chat_ids
+            (as a frozenset)
 
     Raises:
         SystemExit: If the config file is missing, invalid, or improperly formatted
     """
-    config_path = "config.telegram.yaml"
+    config_path = CONFIG_PATH
+
+    try:
+        st = os.stat(config_path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        stat_key = None
+    if stat_key is not None and stat_key == _cached_stat:
+        return _cached
+
+    with _cache_lock:
+        return _load_config(config_path, stat_key)
+
+
+def _load_config(config_path: str, stat_key) -> Dict[str, Union[str, FrozenSet[int]]]:
+    """Parse, validate and cache the configuration file.
+
+    Must be called with _cache_lock held.
+
+    Args:
+        config_path: Path to the configuration file
+        stat_key: Modification time in nanoseconds and size of the file, or
+            None if missing
+
+    Returns:
+        dict: The configuration dictionary
 
-    if not os.path.exists(config_path):
+    Raises:
+        SystemExit: If the config file is missing, invalid, or improperly formatted
+    """
+    global _cached, _cached_stat
+
+    # Another thread may have loaded this version while we waited for the lock
+    if stat_key is not None and stat_key == _cached_stat:
+        return _cached
+
+    if stat_key is None:
         print(f"Error: Configuration file '{config_path}' not found.")
         print("\nPlease create the configuration file with the following format:")
         print(
@@ -43,8 +97,21 @@ To get started:
         sys.exit(1)
 
     try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
+        with open(config_path, "rb") as f:
+            raw = f.read()
+
+        # A JSON copy of the last valid configuration skips YAML parsing, e.g.
+        # on every bot start. It is matched by content, since an edited file
+        # may keep its modification time (cp -p, coarse timestamps).
+        cache_path = _json_cache_path(config_path)
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        config = _read_json_cache(cache_path, len(raw), digest)
+        if config is not None:
+            config["allowed_chat_ids"] = frozenset(config["allowed_chat_ids"])
+            _cached, _cached_stat = config, stat_key
+            return config
+
+        config = yaml.load(raw, Loader=_Loader)
 
         # Validate required fields
         if not config:
@@ -58,6 +125,12 @@ To get started:
         if not config["allowed_chat_ids"]:
             raise ValueError("At least one chat ID must be specified")
 
+        _write_json_cache(cache_path, len(raw), digest, config)
+
+        # Hashed lookups for is_authorized, which runs on every command
+        config["allowed_chat_ids"] = frozenset(config["allowed_chat_ids"])
+
+        _cached, _cached_stat = config, stat_key
         return config
 
     except yaml.YAMLError as e:
@@ -71,7 +144,64 @@ To get started:
         sys.exit(1)
 
 
-def is_authorized(chat_id: int, config: Dict[str, Union[str, List[int]]]) -> bool:
+def _json_cache_path(config_path: str) -> str:
+    """Get the path of the JSON cache for a configuration file.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        str: Path of a hidden .cache.json file next to the configuration
+    """
+    directory, name = os.path.split(config_path)
+    return os.path.join(directory, f".{os.path.splitext(name)[0]}.cache.json")
+
+
+def _read_json_cache(cache_path: str, size: int, digest: str):
+    """Read a cached configuration if it was made from the current file.
+
+    Args:
+        cache_path: Path of the JSON cache
+        size: Size of the configuration file in bytes
+        digest: Hex BLAKE2b hash of the configuration file's content
+
+    Returns:
+        dict: The cached configuration, or None if missing, stale or unreadable
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            cached = orjson.loads(f.read())
+        if cached["size"] == size and cached["blake2b"] == digest:
+            return cached["config"]
+    except Exception:
+        pass
+    return None
+
+
+def _write_json_cache(cache_path: str, size: int, digest: str, config: dict):
+    """Store a validated configuration as JSON, ignoring any errors.
+
+    Args:
+        cache_path: Path of the JSON cache
+        size: Size of the configuration file in bytes
+        digest: Hex BLAKE2b hash of the configuration file's content
+        config: The configuration parsed from that file
+    """
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        # Owner-only, the configuration contains the bot token
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "wb") as f:
+            f.write(orjson.dumps({"size": size, "blake2b": digest, "config": config}))
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def is_authorized(chat_id: int, config: Dict[str, Union[str, FrozenSet[int]]]) -> bool:
     """Check if a chat ID is authorized to use the bot.
 
     Args:
@@ -79,6 +209,32 @@ def is_authorized(chat_id: int, config: Dict[str, Union[str, List[int]]]) -> boo
         config: The bot configuration dictionary
 
     Returns:
-        bool: True if the chat ID is in the allowed list, False otherwise
+        bool: True if the chat ID is in the allowed set, False otherwise
     """
     return chat_id in config["allowed_chat_ids"]
+
+
+def require_auth(handler):
+    """Decorate a command handler to only run for authorized chats.
+
+    The configuration is taken from the application's bot_data, where
+    create_bot stores it, and the chat checked before the handler does any
+    work. Unauthorized chats get a refusal message and the handler is not
+    called. Authorized calls receive the configuration as a third argument.
+
+    Args:
+        handler: Async command handler taking (update, context, config)
+
+    Returns:
+        Async command handler taking (update, context)
+    """
+
+    @wraps(handler)
+    async def wrapper(update, context):
+        config = context.bot_data["config"]
+        if not is_authorized(update.effective_chat.id, config):
+            await update.message.reply_text("You are not authorized to use this bot.")
+            return
+        return await handler(update, context, config)
+
+    return wrapper
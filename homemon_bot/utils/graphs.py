@@ -1,16 +1,64 @@
 """Utilities for generating measurement graphs."""
 
+import asyncio
 import io
-from datetime import datetime
-import matplotlib.pyplot as plt
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Any
 
+# (title, measurement field, unit) of each graph, in the order they are sent
+METRICS = [
+    ("Temperature", "temperature", "°C"),
+    ("Humidity", "humidity", "%"),
+    ("Battery", "battery_voltage", "V"),
+]
+
+# Resolution of the rendered PNGs, 80 dpi gives 800x480 pixel images
+GRAPH_DPI = 80
+
+# Margins of the plot area as fractions of the figure size
+GRAPH_MARGINS = {"left": 0.09, "right": 0.97, "top": 0.93, "bottom": 0.2}
+
+# Processes rendering graphs, started on the first /graphs request. Each one
+# imports matplotlib, so a single-core Pi Zero only gets one.
+GRAPH_WORKERS = min(2, os.cpu_count() or 1)
+_executor = None
+
+# Figure and axes reused by all renders of a worker process
+_figure = None
+_axes = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the graph rendering process pool, starting it on first use."""
+    global _executor
+    if _executor is None:
+        # Forking the multi-threaded bot process is unsafe, start fresh ones
+        _executor = ProcessPoolExecutor(
+            max_workers=GRAPH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_graph_workers() -> None:
+    """Stop the graph rendering processes, if they were started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
 
 async def generate_graphs(
     measurements: List[Dict[str, Any]], hours: int
 ) -> List[io.BytesIO]:
     """Generate line graphs for sensor measurements.
 
+    Rendering is CPU-bound, so it runs in a pool of worker processes where it
+    neither blocks the event loop nor competes for the bot's GIL. matplotlib
+    is only imported by the workers.
+
     Creates three graphs:
         1. Temperature over time for all sensors
         2. Humidity over time for all sensors
@@ -23,44 +71,80 @@ async def generate_graphs(
     Returns:
         list: List of BytesIO objects containing the generated graphs as PNG images
     """
+    loop = asyncio.get_running_loop()
+    images = await loop.run_in_executor(
+        _get_executor(), _render_graphs, measurements, hours
+    )
+    return [io.BytesIO(image) for image in images]
+
+
+def _get_figure():
+    """Return the worker's figure and axes, creating them on first use.
+
+    The object-oriented API without pyplot has no GUI backend probing. Each
+    worker process renders one request at a time, so they can be shared.
+    """
+    global _figure, _axes
+    if _figure is None:
+        from matplotlib.figure import Figure
+
+        _figure = Figure(figsize=(10, 6))
+        _axes = _figure.subplots()
+        # Fixed margins with room for the rotated time labels, instead of
+        # measuring the text with tight_layout on every render
+        _figure.subplots_adjust(**GRAPH_MARGINS)
+    return _figure, _axes
+
+
+def _render_graphs(measurements: List[Dict[str, Any]], hours: int) -> List[bytes]:
+    """Render the graphs for generate_graphs as PNG images, in a worker."""
+    import numpy as np
+    from matplotlib.dates import DateFormatter
+
+    # Columns over all measurements. Timestamps are parsed by numpy in one
+    # vectorised call, missing values become NaN gaps.
+    sensor_ids = np.fromiter(
+        (m["sensor_id"] for m in measurements), dtype=np.int64, count=len(measurements)
+    )
+    columns = {
+        "timestamps": np.array(
+            [m["timestamp"] for m in measurements], dtype="datetime64[us]"
+        )
+    }
+    for _, field, _ in METRICS:
+        columns[field] = np.array([m[field] for m in measurements], dtype=float)
+
+    # Group the rows by sensor, the stable sort keeps each sensor's time order
+    order = np.argsort(sensor_ids, kind="stable")
+    ids, starts = np.unique(sensor_ids[order], return_index=True)
+    sensor_data = {
+        int(sensor_id): {name: column[rows] for name, column in columns.items()}
+        for sensor_id, rows in zip(ids, np.split(order, starts[1:]))
+    }
+
+    # One figure is reused for all metrics and requests, only its axes are
+    # cleared
+    fig, ax = _get_figure()
+    time_format = DateFormatter("%H:%M" if hours <= 24 else "%d.%m. %H:%M")
     graphs = []
-    metrics = [
-        ("Temperature", "temperature", "°C"),
-        ("Humidity", "humidity", "%"),
-        ("Battery", "battery_voltage", "V"),
-    ]
-
-    for title, field, unit in metrics:
-        plt.figure(figsize=(10, 6))
-
-        # Group data by sensor
-        sensor_data = {}
-        for m in measurements:
-            sensor_id = m["sensor_id"]
-            if sensor_id not in sensor_data:
-                sensor_data[sensor_id] = {"timestamps": [], "values": []}
-            sensor_data[sensor_id]["timestamps"].append(
-                datetime.fromisoformat(m["timestamp"])
-            )
-            sensor_data[sensor_id]["values"].append(m[field])
+    for title, field, unit in METRICS:
+        ax.clear()
 
         # Plot each sensor's data
         for sensor_id, data in sensor_data.items():
-            plt.plot(data["timestamps"], data["values"], label=f"Sensor {sensor_id}")
+            ax.plot(data["timestamps"], data[field], label=f"Sensor {sensor_id}")
 
-        plt.title(f"{title} over last {hours}h")
-        plt.xlabel("Time")
-        plt.ylabel(f"{title} ({unit})")
-        plt.legend()
-        plt.grid(True)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        ax.set_title(f"{title} over last {hours}h")
+        ax.set_xlabel("Time")
+        ax.set_ylabel(f"{title} ({unit})")
+        ax.legend()
+        ax.grid(True)
+        ax.xaxis.set_major_formatter(time_format)
+        ax.tick_params(axis="x", labelrotation=45)
 
         # Save to bytes buffer
         buf = io.BytesIO()
-        plt.savefig(buf, format="png")
-        buf.seek(0)
-        graphs.append(buf)
-        plt.close()
+        fig.savefig(buf, format="png", dpi=GRAPH_DPI)
+        graphs.append(buf.getvalue())
 
     return graphs
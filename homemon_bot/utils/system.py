@@ -1,19 +1,65 @@
 """System utilities for WiFi and system operations."""
 
+import asyncio
+import errno
+import fcntl
 import re
 import subprocess
 import ipaddress
-from typing import Dict, List, Union, Optional
+import os
+import socket
+import struct
+import time
+from typing import Awaitable, Callable, Dict, List, Union, Optional, Tuple
+
+# Query addresses and routes over netlink when pyroute2 is installed instead
+# of reading them from sysfs, ioctl and procfs
+try:
+    from pyroute2 import IPRoute
+except ImportError:
+    IPRoute = None
+
+# RFC 1123 hostname; \Z rather than $ so a trailing newline doesn't slip through
+_HOSTNAME_RE = re.compile(
+    r"^[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+    r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*\Z"
+)
+
+# Network devices as exposed by the kernel, wireless ones have a "wireless"
+# subdirectory
+SYS_CLASS_NET = "/sys/class/net"
+
+# The kernel's IPv4 routing table, and the flag of routes via a gateway
+PROC_NET_ROUTE = "/proc/net/route"
+RTF_GATEWAY = 0x2
+
+# ioctl requests for a network device's IPv4 address and netmask
+SIOCGIFADDR = 0x8915
+SIOCGIFNETMASK = 0x891B
+
+# How long successful results are reused, in seconds. Connection details
+# change more often than the list of networks in range.
+WIFI_INFO_CACHE_TTL = 3.0
+SCAN_CACHE_TTL = 15.0
+
+# (time.monotonic() of the lookup, result) of the last successful lookups
+_wifi_info_cache = None
+_scan_cache = None
+
+# Concurrent callers wait for the lookup in progress instead of starting another
+_wifi_info_lock = asyncio.Lock()
+_scan_lock = asyncio.Lock()
+
+
+class WifiError(Exception):
+    """Raised when WiFi information can't be retrieved."""
 
 
 def is_valid_hostname(hostname: str) -> bool:
     """Check if the hostname is valid according to RFC 1123."""
     if len(hostname) > 255:
         return False
-    hostname_regex = re.compile(
-        r"^[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
-    )
-    return bool(hostname_regex.match(hostname))
+    return bool(_HOSTNAME_RE.match(hostname))
 
 
 def is_valid_ip(ip: str) -> bool:
@@ -25,9 +71,39 @@ def is_valid_ip(ip: str) -> bool:
         return False
 
 
-async def get_wifi_info() -> Union[Dict[str, str], str]:
+async def run_command(
+    *args: str, check: bool = True, stderr=asyncio.subprocess.PIPE, text: bool = True
+) -> Union[str, bytes]:
+    """Run a command without blocking the event loop.
+
+    Args:
+        *args: The command and its arguments
+        check: Raise CalledProcessError if the command exits with non-zero status
+        stderr: Where to send stderr, asyncio.subprocess.STDOUT merges it into
+            the returned output
+        text: Decode the output, otherwise it is returned as bytes
+
+    Returns:
+        str: The command's standard output (bytes if text is False)
+
+    Raises:
+        subprocess.CalledProcessError: If check is set and the command failed
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=stderr
+    )
+    out, err = await proc.communicate()
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args, out, err)
+    return out.decode() if text else out
+
+
+async def get_wifi_info() -> Dict[str, str]:
     """Get current WiFi connection information.
 
+    Successful results are cached for WIFI_INFO_CACHE_TTL seconds and must not
+    be modified by callers.
+
     Returns:
         dict: WiFi connection details including:
             - device: WiFi device name (e.g., wlan0)
@@ -37,60 +113,51 @@ async def get_wifi_info() -> Union[Dict[str, str], str]:
             - ip: IP address
             - netmask: Network mask
             - gateway: Gateway address
-        str: Error message if there was a problem getting the information
+
+    Raises:
+        WifiError: If there was a problem getting the information
     """
+    global _wifi_info_cache
+    async with _wifi_info_lock:
+        cached = _wifi_info_cache
+        if cached and time.monotonic() - cached[0] < WIFI_INFO_CACHE_TTL:
+            return cached[1]
+        info = await _get_wifi_info()
+        _wifi_info_cache = (time.monotonic(), info)
+        return info
+
+
+async def _get_wifi_info() -> Dict[str, str]:
+    """Look up current WiFi connection information, bypassing the cache."""
     try:
         # Get the active WiFi device name
-        device_info = subprocess.check_output(
-            ["nmcli", "-t", "-f", "DEVICE,TYPE,STATE", "device"]
-        ).decode()
-        wifi_device = None
-        for line in device_info.split("\n"):
-            if line.strip():
-                dev, typ, state = line.split(":")
-                if typ == "wifi" and state == "connected":
-                    wifi_device = dev
-                    break
+        try:
+            wifi_device = _sysfs_wifi_device()
+        except OSError:
+            wifi_device = await _nmcli_wifi_device()
 
         if not wifi_device:
-            return "No active WiFi connection found"
+            raise WifiError("No active WiFi connection found")
+
+        # The remaining lookups are independent, so run them concurrently
+        ip_info_func = _netlink_ip_info if IPRoute is not None else _kernel_ip_info
+        nmcli_output, ip_info = await asyncio.gather(
+            run_command(
+                "nmcli", "-t", "-f", "SIGNAL,SSID,IN-USE", "device", "wifi", "list"
+            ),
+            asyncio.to_thread(ip_info_func, wifi_device),
+        )
+        mac_address, ip_address, netmask, gateway = ip_info
 
-        # Get SSID and signal strength using nmcli
-        nmcli_output = subprocess.check_output(
-            ["nmcli", "-t", "-f", "SIGNAL,SSID,IN-USE", "device", "wifi", "list"]
-        ).decode()
+        # Get SSID and signal strength from nmcli
         ssid = None
         signal = None
-        for line in nmcli_output.split("\n"):
-            if line.strip():
-                parts = line.split(":")
-                if (
-                    len(parts) >= 3 and parts[2] == "*"
-                ):  # Connected network has "*" in IN-USE field
-                    signal = parts[0]
-                    ssid = parts[1]
-                    break
-
-        # Get IP information and MAC address using the detected WiFi device
-        ip_info = subprocess.check_output(["ip", "addr", "show", wifi_device]).decode()
-        ip_address = None
-        netmask = None
-        mac_address = None
-        for line in ip_info.split("\n"):
-            line = line.strip()
-            if "link/ether" in line:
-                mac_address = line.split()[1]
-            elif "inet " in line:
-                parts = line.split()
-                ip_address = parts[1].split("/")[0]
-                netmask = parts[1].split("/")[1]
-
-        # Get gateway
-        route_info = subprocess.check_output(["ip", "route"]).decode()
-        gateway = None
-        for line in route_info.split("\n"):
-            if "default via" in line:
-                gateway = line.split("via")[1].split()[0]
+        for line in nmcli_output.splitlines():
+            parts = line.split(":", 2)
+            # Connected network has "*" in IN-USE field
+            if len(parts) == 3 and parts[2] == "*":
+                signal, ssid = parts[0], parts[1]
+                break
 
         return {
             "device": wifi_device,
@@ -101,61 +168,194 @@ async def get_wifi_info() -> Union[Dict[str, str], str]:
             "netmask": netmask,
             "gateway": gateway,
         }
+    except WifiError:
+        raise
     except Exception as e:
-        return f"Error getting WiFi info: {str(e)}"
+        raise WifiError(f"Error getting WiFi info: {str(e)}") from e
+
+
+def _sysfs_wifi_device() -> Optional[str]:
+    """Find the connected WiFi device in sysfs, without running nmcli.
+
+    Returns:
+        str: Name of the first wireless device whose link is up, or None
+
+    Raises:
+        OSError: If sysfs is not available
+    """
+    for dev in sorted(os.listdir(SYS_CLASS_NET)):
+        path = os.path.join(SYS_CLASS_NET, dev)
+        if not os.path.isdir(os.path.join(path, "wireless")):
+            continue
+        with open(os.path.join(path, "operstate")) as f:
+            if f.read().strip() == "up":
+                return dev
+    return None
+
+
+async def _nmcli_wifi_device() -> Optional[str]:
+    """Find the connected WiFi device with nmcli.
+
+    Returns:
+        str: Name of the connected WiFi device, or None
+    """
+    device_info = await run_command("nmcli", "-t", "-f", "DEVICE,TYPE,STATE", "device")
+    for line in device_info.splitlines():
+        if not line:
+            continue
+        dev, typ, state = line.split(":", 2)
+        if typ == "wifi" and state == "connected":
+            return dev
+    return None
 
 
-async def scan_wifi_networks() -> Union[List[Dict[str, str]], str]:
+def _netlink_ip_info(device: str) -> Tuple[Optional[str], ...]:
+    """Read addresses of a network device from the kernel over netlink.
+
+    Blocking, run it in a thread.
+
+    Args:
+        device: Name of the network device
+
+    Returns:
+        tuple: MAC address, IPv4 address, prefix length and default gateway,
+            each None if not available
+    """
+    with IPRoute() as ipr:
+        index = ipr.link_lookup(ifname=device)[0]
+        mac_address = ipr.get_links(index)[0].get_attr("IFLA_ADDRESS")
+
+        ip_address = netmask = None
+        addrs = ipr.get_addr(index=index, family=socket.AF_INET)
+        if addrs:
+            ip_address = addrs[-1].get_attr("IFA_ADDRESS")
+            netmask = str(addrs[-1]["prefixlen"])
+
+        routes = ipr.get_default_routes(family=socket.AF_INET)
+        gateway = routes[0].get_attr("RTA_GATEWAY") if routes else None
+
+    return mac_address, ip_address, netmask, gateway
+
+
+def _kernel_ip_info(device: str) -> Tuple[Optional[str], ...]:
+    """Read addresses of a network device from sysfs, ioctl and procfs.
+
+    Used when pyroute2 is not installed, without running the ip command.
+    Blocking, run it in a thread.
+
+    Args:
+        device: Name of the network device
+
+    Returns:
+        tuple: MAC address, IPv4 address, prefix length and default gateway,
+            each None if not available
+    """
+    with open(os.path.join(SYS_CLASS_NET, device, "address")) as f:
+        mac_address = f.read().strip() or None
+
+    ip_address = netmask = None
+    request = struct.pack("256s", device.encode()[:15])
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        try:
+            addr = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)[20:24]
+            mask = fcntl.ioctl(sock.fileno(), SIOCGIFNETMASK, request)[20:24]
+        except OSError as e:
+            # The device has no IPv4 address
+            if e.errno != errno.EADDRNOTAVAIL:
+                raise
+        else:
+            ip_address = socket.inet_ntoa(addr)
+            netmask = str(bin(int.from_bytes(mask, "big")).count("1"))
+
+    return mac_address, ip_address, netmask, default_gateway()
+
+
+def default_gateway() -> Optional[str]:
+    """Find the IPv4 default gateway in the kernel's routing table.
+
+    Reads /proc/net/route, which is cheap enough to call from the event loop.
+
+    Returns:
+        str: Address of the first default route's gateway, or None
+
+    Raises:
+        OSError: If the routing table can't be read
+    """
+    with open(PROC_NET_ROUTE) as f:
+        next(f, None)  # Header
+        for line in f:
+            fields = line.split(None, 4)
+            # Destination 0.0.0.0 via a gateway (RTF_GATEWAY flag)
+            if (
+                len(fields) > 3
+                and fields[1] == "00000000"
+                and int(fields[3], 16) & RTF_GATEWAY
+            ):
+                # The address is in host byte order
+                gateway = int(fields[2], 16)
+                return socket.inet_ntoa(struct.pack("=L", gateway))
+    return None
+
+
+async def scan_wifi_networks() -> List[Dict[str, str]]:
     """Scan for available WiFi networks and sort by signal strength.
 
+    Successful results are cached for SCAN_CACHE_TTL seconds and must not be
+    modified by callers.
+
     Returns:
         list: List of dictionaries containing network information sorted by signal strength:
             - ssid: Network name
             - signal: Signal strength
             - security: Security type
             - mac: MAC address of the access point
-        str: Error message if there was a problem scanning networks
+
+    Raises:
+        WifiError: If there was a problem scanning networks
     """
+    global _scan_cache
+    async with _scan_lock:
+        cached = _scan_cache
+        if cached and time.monotonic() - cached[0] < SCAN_CACHE_TTL:
+            return cached[1]
+        networks = await _scan_wifi_networks()
+        _scan_cache = (time.monotonic(), networks)
+        return networks
+
+
+async def _scan_wifi_networks() -> List[Dict[str, str]]:
+    """Rescan and list WiFi networks, bypassing the cache."""
     try:
         # Rescan WiFi networks
-        subprocess.run(["nmcli", "device", "wifi", "rescan"], check=True)
+        await run_command("nmcli", "device", "wifi", "rescan")
 
         # Get network list
-        output = subprocess.check_output(
-            [
-                "nmcli",
-                "-t",
-                "-f",
-                "SIGNAL,SSID,SECURITY,BSSID",
-                "device",
-                "wifi",
-                "list",
-            ]
-        ).decode()
+        output = await run_command(
+            "nmcli", "-t", "-f", "SIGNAL,SSID,SECURITY,BSSID", "device", "wifi", "list"
+        )
 
         networks = []
-        for line in output.split("\n"):
-            if line.strip():
-                # Split only into 4 parts to keep MAC address intact
-                parts = line.split(":", 3)
-                if len(parts) >= 4:
-                    # Remove backslashes from MAC address
-                    mac = parts[3].replace("\\", "")
-                    networks.append(
-                        {
-                            "signal": int(parts[0]),
-                            "ssid": parts[1],
-                            "security": parts[2] if parts[2] else "None",
-                            "mac": mac,
-                        }
-                    )
+        for line in output.splitlines():
+            # Split only into 4 parts to keep MAC address intact
+            parts = line.split(":", 3)
+            if len(parts) == 4:
+                # Remove backslashes from MAC address
+                mac = parts[3].replace("\\", "")
+                networks.append(
+                    {
+                        "signal": int(parts[0]),
+                        "ssid": parts[1],
+                        "security": parts[2] if parts[2] else "None",
+                        "mac": mac,
+                    }
+                )
 
         # Sort networks by signal strength (highest first)
         networks.sort(key=lambda x: x["signal"], reverse=True)
 
         return networks
     except Exception as e:
-        return f"Error scanning WiFi networks: {str(e)}"
+        raise WifiError(f"Error scanning WiFi networks: {str(e)}") from e
 
 
 async def perform_git_pull() -> str:
@@ -166,15 +366,12 @@ async def perform_git_pull() -> str:
     """
     try:
         # Check if current directory is a git repository
-        subprocess.check_output(
-            ["git", "rev-parse", "--git-dir"], stderr=subprocess.STDOUT
+        await run_command(
+            "git", "rev-parse", "--git-dir", stderr=asyncio.subprocess.STDOUT
         )
 
         # Perform git pull
-        output = subprocess.check_output(
-            ["git", "pull"], stderr=subprocess.STDOUT
-        ).decode()
-        return output
+        return await run_command("git", "pull", stderr=asyncio.subprocess.STDOUT)
     except subprocess.CalledProcessError as e:
         if "not a git repository" in e.output.decode():
             return "Error: Current directory is not a git repository"
@@ -183,12 +380,17 @@ async def perform_git_pull() -> str:
         return f"Error performing git pull: {str(e)}"
 
 
-async def ping_address(address: str, count: int = 5) -> str:
+async def ping_address(
+    address: str,
+    count: int = 5,
+    on_output: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> str:
     """Ping a network address.
 
     Args:
         address: The address to ping (hostname or IP address)
         count: Number of pings to send (default: 5)
+        on_output: Called with the output so far whenever ping prints a line
 
     Returns:
         str: The ping command output or error message
@@ -215,17 +417,29 @@ async def ping_address(address: str, count: int = 5) -> str:
         return "Error: Invalid count value"
 
     try:
-        # Use subprocess.run with a list of arguments to prevent shell injection
-        # capture_output=True captures both stdout and stderr
-        result = subprocess.run(
-            ["ping", "-c", str(count), address],
-            capture_output=True,
-            text=True,
-            check=False,  # Don't raise exception on non-zero exit
+        # Pass a list of arguments (no shell) to prevent shell injection and
+        # return the combined output (stdout + stderr) regardless of exit code
+        proc = await asyncio.create_subprocess_exec(
+            "ping",
+            "-c",
+            str(count),
+            address,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
         )
-
-        # Return combined output (stdout + stderr) regardless of exit code
-        return result.stdout + result.stderr
+        # Read the replies as ping prints them, so the process doesn't outlive
+        # a cancelled command
+        lines = []
+        try:
+            async for line in proc.stdout:
+                lines.append(line)
+                if on_output is not None:
+                    await on_output(b"".join(lines).decode())
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+        return b"".join(lines).decode()
     except subprocess.SubprocessError as e:
         return f"Error executing ping command: {str(e)}"
     except Exception as e:
@@ -8,6 +8,14 @@ import asyncio
 from homemon.monitor import main
 
 if __name__ == "__main__":
+    # Prefer uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
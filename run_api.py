@@ -11,56 +11,21 @@ Command line arguments:
     --db: Path to the SQLite database file (default: sensor_data.db)
     --host: Host to bind the server to (default: 0.0.0.0)
     --port: Port to bind the server to (default: 8000)
+    --access-log: Log every request (default: off)
+    --workers: Number of worker processes (default: 1)
+    --dev: Development mode, disables browser caching of the web UI
+    --cors-origin: Origin allowed to make cross-origin API requests, may be
+        given multiple times (default: any origin)
 
 Example usage:
     ./run_api.py
     ./run_api.py --db custom.db --port 8080
+    ./run_api.py --cors-origin http://dashboard.lan
 """
 
 import argparse
 import os
 import uvicorn
-from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from homemon.api import init_app
-
-
-class NoCacheMiddleware(BaseHTTPMiddleware):
-    """Middleware to disable caching for static files during development.
-
-    This middleware adds headers to prevent caching of static files, which is
-    useful during development to ensure changes are immediately visible.
-
-    Args:
-        app: The FastAPI application instance
-
-    Note:
-        Remove this middleware in production to enable default caching behavior
-        for better performance.
-    """
-
-    async def dispatch(self, request: Request, call_next):
-        """Process the request and add no-cache headers for static files.
-
-        Args:
-            request (Request): The incoming HTTP request
-            call_next: The next middleware or route handler in the chain
-
-        Returns:
-            Response: The HTTP response with added cache control headers for
-                static files
-        """
-        response = await call_next(request)
-        if request.url.path.startswith("/static/"):
-            response.headers["Cache-Control"] = (
-                "no-store, no-cache, must-revalidate, proxy-revalidate, max-age=0"
-            )
-            response.headers["Pragma"] = "no-cache"
-            response.headers["Expires"] = "0"
-        return response
 
 
 def main():
@@ -68,13 +33,10 @@ def main():
 
     This function:
         1. Parses command line arguments for server configuration
-        2. Creates and configures the FastAPI application:
-            - Adds CORS middleware for cross-origin requests
-            - Adds no-cache middleware for development
-            - Mounts static files from the webui directory
-            - Initializes and mounts the API endpoints
-            - Sets up the root route to serve index.html
-        3. Starts the uvicorn server with the specified configuration
+        2. Passes the database path to the application factory
+           (homemon.asgi.create_app) through the HOMEMON_DB variable
+        3. Starts the uvicorn server, which creates the application in each
+           worker process
 
     The server provides:
         - Static file serving for the web UI
@@ -99,6 +61,29 @@ def main():
         default=8000,
         help="Port to bind the server to (default: 8000)",
     )
+    parser.add_argument(
+        "--access-log",
+        action="store_true",
+        help="Log every request (default: off)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--dev",
+        action="store_true",
+        help="Development mode, disables browser caching of the web UI",
+    )
+    parser.add_argument(
+        "--cors-origin",
+        action="append",
+        default=[],
+        help="Origin allowed to make cross-origin API requests, may be given "
+        "multiple times (default: any origin)",
+    )
     args = parser.parse_args()
 
     db_path = args.db
@@ -106,49 +91,23 @@ def main():
         print(f"Error: Database file not found at '{db_path}'. Exiting.")
         return
 
-    # Create the main FastAPI app
-    app = FastAPI()
-
-    # Add CORS middleware to the main app
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-    # Add no-cache middleware for development
-    # TODO: Remove this in production to enable default caching behavior
-    app.add_middleware(NoCacheMiddleware)
-
-    # Get the directory of this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    webui_dir = os.path.join(script_dir, "webui")
-
-    # Mount the static files
-    app.mount("/static", StaticFiles(directory=webui_dir), name="static")
-
-    # Initialize and mount the API app
-    api_app = init_app(args.db)
-    app.mount("/api", api_app)
-
-    # Serve index.html at the root path
-    @app.get("/")
-    async def read_root():
-        """Serve the main web UI page.
-
-        Returns:
-            FileResponse: The index.html file from the webui directory
-        """
-        return FileResponse(os.path.join(webui_dir, "index.html"))
+    # Workers build their own app instance, pass the settings via the environment
+    os.environ["HOMEMON_DB"] = os.path.abspath(db_path)
+    if args.dev:
+        os.environ["HOMEMON_DEV"] = "1"
+    if args.cors_origin:
+        os.environ["HOMEMON_CORS_ORIGINS"] = ",".join(args.cors_origin)
 
-    # Run the server
+    # Run the server. uvicorn picks uvloop and the httptools parser when they
+    # are installed (uvicorn[standard]).
     uvicorn.run(
-        app,
+        "homemon.asgi:create_app",
+        factory=True,
         host=args.host,
         port=args.port,
         reload=False,  # Disable reload in production
+        access_log=args.access_log,
+        workers=args.workers,
     )
 
 
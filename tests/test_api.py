@@ -0,0 +1,156 @@
+"""Tests for the Home Monitor API."""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from homemon.api import _epoch, init_app
+from homemon.database import SCHEMA_VERSION, SensorDatabase
+
+# Schema of databases created before the ts_epoch column was added
+OLD_SCHEMA = """
+    CREATE TABLE sensors (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mac_address TEXT UNIQUE NOT NULL,
+        alias TEXT
+    );
+    CREATE TABLE measurements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sensor_id INTEGER NOT NULL,
+        timestamp DATETIME NOT NULL,
+        temperature REAL NOT NULL,
+        humidity INTEGER NOT NULL,
+        battery_voltage REAL NOT NULL,
+        FOREIGN KEY (sensor_id) REFERENCES sensors (id)
+    );
+"""
+
+START = datetime(2024, 1, 31, 12, 0, 0)
+
+
+def _measurements(count):
+    """Rows of one sensor, one minute apart starting at START."""
+    return [
+        (1, (START + timedelta(minutes=i)).isoformat(), 20.0 + i, 40 + i, 3.0)
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def old_db(tmp_path):
+    """Path of a database with the schema from before ts_epoch."""
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(OLD_SCHEMA)
+    conn.execute("INSERT INTO sensors (mac_address) VALUES ('AA:BB')")
+    conn.executemany(
+        "INSERT INTO measurements "
+        "(sensor_id, timestamp, temperature, humidity, battery_voltage) "
+        "VALUES (?, ?, ?, ?, ?)",
+        _measurements(5),
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def client(tmp_path):
+    """Client of the API over a database with two sensors."""
+    path = str(tmp_path / "sensors.db")
+    with SensorDatabase(path) as db:
+        first = db.get_or_create_sensor("AA:BB")
+        second = db.get_or_create_sensor("CC:DD")
+        db.store_measurements(
+            [
+                (sensor_id, timestamp, *values)
+                for sensor_id in (first, second)
+                for _, timestamp, *values in _measurements(3)
+            ]
+        )
+    app = init_app(path, pool_size=1)
+    try:
+        yield TestClient(app)
+    finally:
+        app.state.db.close()
+
+
+def test_epoch_matches_sqlite_strftime():
+    conn = sqlite3.connect(":memory:")
+    for value in (START, datetime(1999, 12, 31, 23, 59, 59), datetime(2038, 2, 1)):
+        expected = conn.execute(
+            "SELECT CAST(strftime('%s', ?) AS INTEGER)", (value.isoformat(),)
+        ).fetchone()[0]
+        assert _epoch(value) == expected
+
+
+def test_epoch_ignores_timezone_and_microseconds():
+    aware = START.replace(tzinfo=timezone(timedelta(hours=2)))
+    assert _epoch(aware) == _epoch(START)
+    assert _epoch(START.replace(microsecond=999999)) == _epoch(START)
+
+
+def test_api_upgrades_old_schema(old_db):
+    app = init_app(old_db, pool_size=1)
+    try:
+        with SensorDatabase(old_db, read_only=True) as db:
+            version = db.conn.execute("PRAGMA user_version").fetchone()[0]
+        assert version == SCHEMA_VERSION
+
+        client = TestClient(app)
+        response = client.get(
+            "/measurements/1",
+            params={
+                "start_time": (START + timedelta(minutes=1)).isoformat(),
+                "end_time": (START + timedelta(minutes=3)).isoformat(),
+            },
+        )
+        assert response.status_code == 200
+        assert [m["timestamp"] for m in response.json()] == [
+            (START + timedelta(minutes=i)).isoformat() for i in (3, 2, 1)
+        ]
+    finally:
+        app.state.db.close()
+
+
+def test_sensors_etag_not_modified(client):
+    response = client.get("/sensors")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = client.get("/sensors", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = client.get("/sensors", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+def test_bulk_measurements(client):
+    response = client.get(
+        "/measurements",
+        params={
+            "sensor_ids": "2,1,2",
+            "start_time": (START + timedelta(minutes=1)).isoformat(),
+        },
+    )
+    assert response.status_code == 200
+    assert [(m["sensor_id"], m["timestamp"]) for m in response.json()] == [
+        (sensor_id, (START + timedelta(minutes=i)).isoformat())
+        for sensor_id in (1, 2)
+        for i in (1, 2)
+    ]
+
+
+@pytest.mark.parametrize("path", ["/measurements", "/measurements/stats"])
+@pytest.mark.parametrize("sensor_ids", ["1,x", "", " , ", "1;2"])
+def test_bulk_invalid_sensor_ids(client, path, sensor_ids):
+    response = client.get(path, params={"sensor_ids": sensor_ids})
+    assert response.status_code == 400
@@ -0,0 +1,157 @@
+"""Tests for the Home Monitor web server."""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from homemon.asgi import WEBUI_DIR, _parse_range, create_app
+from homemon.database import SensorDatabase
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-200", (90, 99)),
+        # Open-ended range
+        ("bytes=95-", (95, 99)),
+        # Suffix ranges, the last N bytes
+        ("bytes=-10", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        # Multiple ranges and invalid headers get the whole file
+        ("bytes=0-9,20-29", None),
+        ("bytes=-", None),
+        ("bytes=a-b", None),
+        ("items=0-9", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert _parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=100-200", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(ValueError):
+        _parse_range(header, 100)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Client of the web server over an empty database."""
+    path = str(tmp_path / "sensors.db")
+    with SensorDatabase(path):
+        pass
+    monkeypatch.setenv("HOMEMON_DB", path)
+    monkeypatch.delenv("HOMEMON_DEV", raising=False)
+    monkeypatch.delenv("HOMEMON_CORS_ORIGINS", raising=False)
+    with TestClient(create_app()) as client:
+        yield client
+
+
+@pytest.fixture
+def favicon():
+    with open(f"{WEBUI_DIR}/favicon.svg", "rb") as f:
+        return f.read()
+
+
+def test_static_file(client, favicon):
+    response = client.get("/static/favicon.svg", headers={"Accept-Encoding": ""})
+    assert response.status_code == 200
+    assert response.content == favicon
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "content-encoding" not in response.headers
+
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+    response = client.get("/static/favicon.svg", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+def test_static_file_compressed(client, favicon):
+    strong_etag = client.get(
+        "/static/favicon.svg", headers={"Accept-Encoding": ""}
+    ).headers["etag"]
+
+    response = client.get("/static/favicon.svg", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == favicon
+
+    # Compressed copies have a weak version of the ETag
+    etag = response.headers["etag"]
+    assert etag == f"W/{strong_etag}"
+    response = client.get(
+        "/static/favicon.svg",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_static_range(client, favicon):
+    size = len(favicon)
+    response = client.get("/static/favicon.svg", headers={"Range": "bytes=-10"})
+    assert response.status_code == 206
+    assert response.content == favicon[-10:]
+    assert response.headers["content-range"] == f"bytes {size - 10}-{size - 1}/{size}"
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/static/favicon.svg", headers={"Range": "bytes=5-"})
+    assert response.status_code == 206
+    assert response.content == favicon[5:]
+
+    response = client.get("/static/favicon.svg", headers={"Range": "bytes=0-1,5-6"})
+    assert response.status_code == 200
+    assert response.content == favicon
+
+
+def test_static_range_unsatisfiable(client, favicon):
+    response = client.get(
+        "/static/favicon.svg", headers={"Range": f"bytes={len(favicon)}-"}
+    )
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(favicon)}"
+
+
+def test_static_if_range(client, favicon):
+    etag = client.get("/static/favicon.svg", headers={"Accept-Encoding": ""}).headers[
+        "etag"
+    ]
+    response = client.get(
+        "/static/favicon.svg", headers={"Range": "bytes=0-9", "If-Range": etag}
+    )
+    assert response.status_code == 206
+    assert response.content == favicon[:10]
+
+    response = client.get(
+        "/static/favicon.svg", headers={"Range": "bytes=0-9", "If-Range": '"old"'}
+    )
+    assert response.status_code == 200
+    assert response.content == favicon
+
+    # Bytes of the uncompressed file can't continue a compressed download
+    response = client.get(
+        "/static/favicon.svg", headers={"Range": "bytes=0-9", "If-Range": f"W/{etag}"}
+    )
+    assert response.status_code == 200
+    assert response.content == favicon
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/static/../homemon/asgi.py",
+        "/static/%2e%2e/homemon/asgi.py",
+        "/static/..%2fhomemon%2fasgi.py",
+        "/static/css/../../homemon/asgi.py",
+        "/static//etc/passwd",
+        "/static/missing.js",
+    ],
+)
+def test_static_path_traversal(client, path):
+    assert client.get(path).status_code == 404